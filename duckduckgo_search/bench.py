@@ -0,0 +1,489 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import socket
+import ssl
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from time import perf_counter, sleep
+from types import TracebackType
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+import primp
+
+from .duckduckgo_search import DDGS
+from .exceptions import DuckDuckGoSearchException, RatelimitException
+from .utils import json_dumps
+
+try:
+    HAS_H2 = True
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:
+    HAS_H2 = False
+
+logger = logging.getLogger("duckduckgo_search.bench")
+
+BENCH_MIX = {"text": 3.0, "news": 1.0, "images": 1.0, "videos": 1.0}
+BENCH_HOSTS = ("https://duckduckgo.com", "https://html.duckduckgo.com", "https://lite.duckduckgo.com")
+FIXTURE_FILES = {"/": "vqd.html", "/html": "html.html", "/lite/": "lite.html"}  # others: i.json, v.json, news.json
+PAGE_FILLER = "<p>filler</p>" * 1500  # about the size of a real html page
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandInServer
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        self._respond(url.path, dict(parse_qsl(url.query)))
+
+    def do_POST(self) -> None:
+        form = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        self._respond(urlsplit(self.path).path, dict(parse_qsl(form)))
+
+    def _respond(self, path: str, params: dict[str, str]) -> None:
+        status, content_type, body = self.server.response(path, params)
+        sleep(self.server.delay())
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local stand-in of the duckduckgo.com endpoints used by DDGS, with injectable latency and ratelimits.
+
+    It serves the vqd page, the html and lite text results, and the i.js, v.js and news.js json results,
+    generated for any query or read from recorded fixture files. A `ratelimit` fraction of the requests is
+    answered with 202 or 429. It speaks HTTP/1.1, optionally over TLS, and HTTP/2 (negotiated with ALPN over
+    TLS, or with prior knowledge over plain http) with the optional h2 package. `connections` counts the
+    accepted connections per protocol.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        ratelimit: float = 0.0,
+        results_per_page: int = 10,
+        pages: int = 3,
+        fixtures_dir: str | os.PathLike[str] | None = None,
+        seed: int | None = None,
+        certfile: str | os.PathLike[str] | None = None,
+        keyfile: str | os.PathLike[str] | None = None,
+        http2: bool = False,
+    ) -> None:
+        """Initialize the server and bind it.
+
+        Args:
+            host: interface to listen on. Defaults to "127.0.0.1".
+            port: port to listen on, 0 for a free port. Defaults to 0.
+            latency: seconds before each response. Defaults to 0.05.
+            jitter: max random seconds added to the latency. Defaults to 0.0.
+            ratelimit: fraction of the requests answered with 202 or 429. Defaults to 0.0.
+            results_per_page: results of a generated page. Defaults to 10.
+            pages: pages of results of a generated query. Defaults to 3.
+            fixtures_dir: directory with recorded responses (vqd.html, html.html, lite.html, i.json, v.json,
+                news.json) served instead of the generated ones. Defaults to None.
+            seed: seed of the latency jitter and ratelimits. Defaults to None.
+            certfile: certificate file, serve https instead of http. Defaults to None.
+            keyfile: private key file of the certificate. Defaults to None.
+            http2: serve HTTP/2 too, requires the h2 package. Defaults to False.
+        """
+        if http2 and not HAS_H2:
+            raise DuckDuckGoSearchException("The HTTP/2 stand-in server requires the h2 package: pip install h2")
+        self.host = host
+        self.http2 = http2
+        self._ssl_context = None
+        if certfile:
+            self._ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self._ssl_context.load_cert_chain(certfile, keyfile)
+            self._ssl_context.set_alpn_protocols(["h2", "http/1.1"] if http2 else ["http/1.1"])
+        self.latency = latency
+        self.jitter = jitter
+        self.ratelimit = ratelimit
+        self.results_per_page = results_per_page
+        self.pages = pages
+        self.fixtures: dict[str, bytes] = {}
+        if fixtures_dir:
+            for path in ("/", "/html", "/lite/", "/i.js", "/v.js", "/news.js"):
+                filename = os.path.join(fixtures_dir, FIXTURE_FILES.get(path, f"{path.strip('/')[:-3]}.json"))
+                if os.path.exists(filename):
+                    with open(filename, "rb") as file:
+                        self.fixtures[path] = file.read()
+        self.requests = 0
+        self.ratelimited = 0
+        self.connections: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        super().__init__((host, port), _StandInHandler)
+
+    def __enter__(self) -> StandInServer:
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_val: BaseException | None = None,
+        exc_tb: TracebackType | None = None,
+    ) -> None:
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def url(self) -> str:
+        return f"{'https' if self._ssl_context else 'http'}://{self.host}:{self.server_port}"
+
+    def finish_request(self, request: Any, client_address: Any) -> None:
+        """Serve a connection in its thread: TLS handshake, then HTTP/1.1 or HTTP/2."""
+        try:
+            if self._ssl_context is not None:
+                request = self._ssl_context.wrap_socket(request, server_side=True)
+                protocol = request.selected_alpn_protocol() or "http/1.1"
+            elif self.http2 and request.recv(3, socket.MSG_PEEK | socket.MSG_WAITALL) == b"PRI":
+                protocol = "h2"  # prior knowledge: the connection starts with the HTTP/2 preface
+            else:
+                protocol = "http/1.1"
+        except OSError as ex:
+            logger.debug(f"{client_address} {type(ex).__name__}: {ex}")
+            return
+        with self._lock:
+            self.connections[protocol] += 1
+        try:
+            if protocol == "h2":
+                self._serve_h2(request)
+            else:
+                super().finish_request(request, client_address)
+        finally:
+            if self._ssl_context is not None:
+                request.close()
+
+    def _serve_h2(self, sock: socket.socket) -> None:
+        """Serve an HTTP/2 connection, each stream is answered in its own thread after the latency."""
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        window = threading.Condition()  # guards conn, notified when the peer grants more flow control window
+        streams: dict[int, tuple[dict[str, str], bytearray]] = {}
+        closed = False
+
+        def respond(stream_id: int, headers: dict[str, str], body: bytes) -> None:
+            url = urlsplit(headers[":path"])
+            params = dict(parse_qsl(body.decode() if headers[":method"] == "POST" else url.query))
+            status, content_type, data = self.response(url.path, params)
+            sleep(self.delay())
+            response_headers = [(":status", str(status)), ("content-type", content_type)]
+            try:
+                with window:
+                    conn.send_headers(stream_id, [*response_headers, ("content-length", str(len(data)))], not data)
+                    while data and not closed:
+                        size = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size)
+                        if size <= 0:
+                            window.wait(1)
+                            continue
+                        conn.send_data(stream_id, data[:size], end_stream=size >= len(data))
+                        data = data[size:]
+                        sock.sendall(conn.data_to_send())
+                    sock.sendall(conn.data_to_send())
+            except (OSError, h2.exceptions.H2Error) as ex:
+                logger.debug(f"h2 stream {stream_id} {type(ex).__name__}: {ex}")
+
+        with window:
+            conn.initiate_connection()
+            sock.sendall(conn.data_to_send())
+        try:
+            while data := sock.recv(65536):
+                with window:
+                    for event in conn.receive_data(data):
+                        if isinstance(event, h2.events.RequestReceived):
+                            headers = {str(name): str(value) for name, value in event.headers}  # decoded as utf-8
+                            streams[event.stream_id] = (headers, bytearray())
+                        elif isinstance(event, h2.events.DataReceived):
+                            streams[event.stream_id][1].extend(event.data)
+                            conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                        elif isinstance(event, h2.events.StreamEnded):
+                            headers, body = streams.pop(event.stream_id)
+                            args = (event.stream_id, headers, bytes(body))
+                            threading.Thread(target=respond, args=args, daemon=True).start()
+                    sock.sendall(conn.data_to_send())
+                    window.notify_all()
+        except (OSError, h2.exceptions.H2Error) as ex:
+            logger.debug(f"h2 connection {type(ex).__name__}: {ex}")
+        finally:
+            with window:
+                closed = True
+                window.notify_all()
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter) if self.jitter else self.latency
+
+    def response(self, path: str, params: dict[str, str]) -> tuple[int, str, bytes]:
+        """Get the (status, content type, body) of a request."""
+        with self._lock:
+            self.requests += 1
+            if self.ratelimit and self._random.random() < self.ratelimit:
+                self.ratelimited += 1
+                return self._random.choice((202, 429)), "text/html", b""
+        content_type = "application/json" if path.endswith(".js") else "text/html"
+        if path in self.fixtures:
+            return 200, content_type, self.fixtures[path]
+        query = params.get("q", "")
+        page = int(params.get("s", 0) or 0) // self.results_per_page
+        if path == "/":
+            return 200, content_type, f'<html><script>vqd="4-{abs(hash(query))}";</script>{PAGE_FILLER}</html>'.encode()
+        if path == "/html":
+            return 200, content_type, self._html_page(query, page).encode()
+        if path == "/lite/":
+            return 200, content_type, self._lite_page(query, page).encode()
+        if path in ("/i.js", "/v.js", "/news.js"):
+            return 200, content_type, json_dumps(self._json_page(path, query, page), indent=False).encode()
+        return 404, "text/html", b""
+
+    def _urls(self, query: str, page: int) -> list[str]:
+        start = page * self.results_per_page
+        return [
+            f"https://example.com/{query.replace(' ', '-')}/{i}" for i in range(start, start + self.results_per_page)
+        ]
+
+    def _next_form(self, query: str, page: int) -> str:
+        if page + 1 >= self.pages:
+            return ""
+        start = (page + 1) * self.results_per_page
+        return (
+            f'<form><input type="submit" value="Next"><input type="hidden" name="q" value="{query}">'
+            f'<input type="hidden" name="s" value="{start}"></form>'
+        )
+
+    def _html_page(self, query: str, page: int) -> str:
+        rows = "".join(
+            f'<div><h2><a href="{url}">{query} result {i}</a></h2><a href="{url}">about {query} {i}</a></div>'
+            for i, url in enumerate(self._urls(query, page))
+        )
+        nav = f'<div class="nav-link">{self._next_form(query, page)}</div>' if page + 1 < self.pages else ""
+        return f"<html><body>{rows}{nav}{PAGE_FILLER}</body></html>"
+
+    def _lite_page(self, query: str, page: int) -> str:
+        rows = "".join(
+            f'<tr><td><a href="{url}">{query} result {i}</a></td></tr>'
+            f"<tr><td class='result-snippet'>about {query} {i}</td></tr><tr><td></td></tr><tr><td></td></tr>"
+            for i, url in enumerate(self._urls(query, page))
+        )
+        return f"<html><body>{PAGE_FILLER}{self._next_form(query, page)}<table>{rows}</table></body></html>"
+
+    def _json_page(self, path: str, query: str, page: int) -> dict[str, Any]:
+        urls = self._urls(query, page)
+        if path == "/i.js":
+            results = [
+                {"title": query, "image": f"{u}.jpg", "thumbnail": f"{u}.th.jpg", "url": u, "height": 600, "width": 800}
+                for u in urls
+            ]
+            for result in results:
+                result["source"] = "Bing"
+        elif path == "/v.js":
+            results = [{"content": u, "title": query, "description": "", "duration": "1:00"} for u in urls]
+        else:
+            results = [{"date": 1700000000, "title": query, "excerpt": "", "url": u, "source": ""} for u in urls]
+        next_page = f"{path.lstrip('/')}?s={(page + 1) * self.results_per_page}" if page + 1 < self.pages else None
+        return {"results": results, "next": next_page}
+
+
+class _Timings(threading.local):
+    def __init__(self) -> None:
+        self.sleep = 0.0
+        self.network = 0.0
+        self.ratelimited = False
+
+
+class _BenchDDGS(DDGS):
+    """DDGS sending its requests to the stand-in server, timing pacing sleeps and network waits per thread."""
+
+    def __init__(self, base_url: str, interval: float, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+        self.interval = interval
+        self.timings = _Timings()
+
+    def _sleep(self, sleeptime: float = 0.75, deadline: float | None = None) -> None:
+        start = perf_counter()
+        try:
+            super()._sleep(self.interval, deadline)
+        finally:
+            self.timings.sleep += perf_counter() - start
+
+    def _get_url(self, method: Any, url: str, *args: Any, **kwargs: Any) -> Any:
+        url = next((self.base_url + url[len(host) :] for host in BENCH_HOSTS if url.startswith(host)), url)
+        start, slept = perf_counter(), self.timings.sleep
+        try:
+            return super()._get_url(method, url, *args, **kwargs)
+        except RatelimitException:
+            self.timings.ratelimited = True
+            raise
+        finally:
+            self.timings.network += perf_counter() - start - (self.timings.sleep - slept)
+
+    def _iter_body(self, resp: primp.Response, deadline: float | None = None) -> Any:
+        chunks = super()._iter_body(resp, deadline)
+        while True:
+            start = perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            finally:
+                self.timings.network += perf_counter() - start
+            yield chunk
+
+
+def _percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))] if values else 0.0
+
+
+def _parse_mix(mix: str | dict[str, float]) -> dict[str, float]:
+    """Parse a query mix "text:3,news:1" into {vertical: weight}."""
+    if isinstance(mix, dict):
+        weights = mix
+    else:
+        weights = {}
+        for item in mix.split(","):
+            vertical, _, weight = item.partition(":")
+            weights[vertical.strip()] = float(weight or 1)
+    unknown = set(weights) - BENCH_MIX.keys()
+    if unknown:
+        raise ValueError(f"Unknown verticals: {sorted(unknown)}, available verticals: {list(BENCH_MIX)}")
+    return weights
+
+
+def run_bench(
+    base_url: str,
+    mix: str | dict[str, float] = BENCH_MIX,
+    concurrency: int = 1,
+    queries: int = 20,
+    rate: float | None = None,
+    interval: float = 0.75,
+    max_results: int | None = None,
+    backend: str = "auto",
+    proxy: str | None = None,
+    seed: int | None = None,
+    verify: bool = True,
+    http2: bool = False,
+) -> dict[str, Any]:
+    """Run a query mix against a server and report throughput, latency and where the time went.
+
+    Args:
+        base_url: url of the stand-in server, the duckduckgo.com hosts are replaced by it.
+        mix: weights of the verticals, e.g. "text:3,news:1". Defaults to BENCH_MIX.
+        concurrency: number of worker threads sharing one DDGS instance. Defaults to 1.
+        queries: number of queries. Defaults to 20.
+        rate: start a query every 1/rate seconds (open loop), the latency includes the wait for a free worker.
+            Defaults to None (closed loop: each worker starts the next query when the previous one is done).
+        interval: pacing interval of the DDGS instance in seconds. Defaults to 0.75.
+        max_results: max_results of the queries, None for one page. Defaults to None.
+        backend: backend of the text queries. Defaults to "auto".
+        proxy: proxy of the DDGS instance. Defaults to None.
+        seed: seed of the query mix. Defaults to None.
+        verify: SSL verification of the DDGS instance, False for a self-signed stand-in. Defaults to True.
+        http2: http2 of the DDGS instance, see DDGS. Defaults to False.
+
+    Returns:
+        Dictionary with the counts of ok, ratelimited and failed queries and of their results, the throughput
+        in queries/s, the p50/p95/p99 latencies and the mean sleep, network, parse and queue seconds per query.
+    """
+    weights = _parse_mix(mix)
+    rng = random.Random(seed)
+    verticals = rng.choices(list(weights), list(weights.values()), k=queries)
+    ddgs = _BenchDDGS(base_url, interval, proxy=proxy, verify=verify, http2=http2)
+    ids = count()
+    samples: list[tuple[str, float, float, float, float, float, int]] = []  # outcome, latency, times, results
+
+    def run(vertical: str, scheduled: float) -> None:
+        start = perf_counter()
+        ddgs.timings.sleep = ddgs.timings.network = 0.0
+        ddgs.timings.ratelimited = False
+        kwargs: dict[str, Any] = {"max_results": max_results}
+        if vertical == "text":
+            kwargs["backend"] = backend
+        results = 0
+        try:
+            results = len(getattr(ddgs, vertical)(f"bench query {next(ids)}", **kwargs))
+            outcome = "ok"
+        except Exception as ex:
+            # text() reraises the error of its last backend as a DuckDuckGoSearchException
+            outcome = "ratelimited" if ddgs.timings.ratelimited else "error"
+            logger.info(f"run_bench() {vertical} {outcome} {type(ex).__name__}: {ex}")
+        end = perf_counter()
+        elapsed, timings = end - start, ddgs.timings
+        samples.append(
+            (
+                outcome,
+                end - scheduled,
+                timings.sleep,
+                timings.network,
+                elapsed - timings.sleep - timings.network,
+                start - scheduled,
+                results,
+            )
+        )
+
+    pending = iter(verticals)
+    lock = threading.Lock()
+
+    def worker() -> None:
+        """Closed loop: run the next query as soon as the previous one is done."""
+        while True:
+            with lock:
+                vertical = next(pending, None)
+            if vertical is None:
+                return
+            run(vertical, perf_counter())
+
+    start = perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        futures: list[Future[None]] = []
+        if rate:
+            for i, vertical in enumerate(verticals):
+                scheduled = start + i / rate
+                sleep(max(0.0, scheduled - perf_counter()))
+                futures.append(executor.submit(run, vertical, scheduled))
+        else:
+            futures = [executor.submit(worker) for _ in range(concurrency)]
+        for future in futures:
+            future.result()
+    elapsed = perf_counter() - start
+
+    latencies = sorted(s[1] for s in samples)
+    n = len(samples) or 1
+    return {
+        "concurrency": concurrency,
+        "rate": rate,
+        "queries": len(samples),
+        "ok": sum(s[0] == "ok" for s in samples),
+        "ratelimited": sum(s[0] == "ratelimited" for s in samples),
+        "errors": sum(s[0] == "error" for s in samples),
+        "throughput": len(samples) / elapsed if elapsed else 0.0,
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "p99": _percentile(latencies, 99),
+        "sleep": sum(s[2] for s in samples) / n,
+        "network": sum(s[3] for s in samples) / n,
+        "parse": sum(s[4] for s in samples) / n,
+        "queue": sum(s[5] for s in samples) / n,
+        "results": sum(s[6] for s in samples),
+    }
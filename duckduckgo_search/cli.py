@@ -3,13 +3,16 @@ from __future__ import annotations
 import csv
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext, suppress
 from datetime import datetime
 from pathlib import Path
+from time import time
+from typing import Any, TextIO
 from urllib.parse import unquote
 
 import click
-import primp
 
 from .duckduckgo_search import DDGS
 from .utils import _expand_proxy_tb_alias, json_dumps
@@ -91,16 +94,121 @@ def _sanitize_keywords(keywords: str) -> str:
     return keywords
 
 
-def _download_file(url: str, dir_path: str, filename: str, proxy: str | None, verify: bool) -> None:
-    try:
-        resp = primp.Client(proxy=proxy, impersonate="random", impersonate_os="random", timeout=10, verify=verify).get(
-            url
+def _search(function_name: str, proxy: str | None, verify: bool, **kwargs: Any) -> list[dict[str, str]]:
+    """Run the search on the `ddgs serve` daemon if it is running, otherwise in this process.
+
+    In-process searches continue the session saved in the $DDGS_STATE file, if set, and save it back.
+    text and news results are added to the local index in the $DDGS_INDEX file, if set.
+    """
+    from .daemon import daemon_request
+
+    proxy = _expand_proxy_tb_alias(proxy)
+    data = daemon_request(function_name, kwargs, proxy=proxy, verify=verify)
+    if data is None:
+        state_path = os.environ.get("DDGS_STATE")
+        ddgs = (
+            DDGS.from_state(state_path, proxy=proxy, verify=verify) if state_path else DDGS(proxy=proxy, verify=verify)
         )
-        if resp.status_code == 200:
-            with open(os.path.join(dir_path, filename[:200]), "wb") as file:
-                file.write(resp.content)
-    except Exception as ex:
-        logger.debug(f"download_file url={url} {type(ex).__name__} {ex}")
+        try:
+            data = getattr(ddgs, function_name)(**kwargs)
+        finally:
+            if state_path:
+                ddgs.save_state(state_path)
+    index_path = os.environ.get("DDGS_INDEX")
+    if index_path:
+        from .index import URL_KEYS, ResultIndex
+
+        if function_name in URL_KEYS:
+            with ResultIndex(index_path) as index:
+                index.add(data, function_name, kwargs["keywords"])
+    return data
+
+
+def _check_keywords(
+    keywords: str | None, keywords_file: TextIO | None, output: str | None = None, download: bool = False
+) -> str:
+    """Check the options of a single search (-k) or a bulk search (-K), which writes JSON lines."""
+    if keywords_file is None:
+        if not keywords:
+            raise click.UsageError("Missing option '-k' / '--keywords' or '-K' / '--keywords-file'.")
+        return keywords
+    if keywords:
+        raise click.UsageError("Options '-k' / '--keywords' and '-K' / '--keywords-file' cannot be combined.")
+    if download:
+        raise click.UsageError("Option '-d' / '--download' is not supported with '-K' / '--keywords-file'.")
+    if output and (output in ("csv", "json") or output.endswith((".csv", ".json"))):
+        raise click.UsageError("With '-K' / '--keywords-file', '-o' is a JSON lines file, e.g. results.jsonl.")
+    return ""
+
+
+def _bulk_search(
+    function_name: str,
+    keywords_file: TextIO,
+    workers: int,
+    output: str | None,
+    proxy: str | None,
+    verify: bool,
+    **kwargs: Any,
+) -> None:
+    """Search every line of keywords_file in `workers` threads sharing one DDGS instance and its pacing.
+
+    One JSON line {"keywords", "results", "error"} per keyword is written to output (stdout by default)
+    as soon as its search finishes, and a throughput and error summary to stderr at the end.
+    """
+    from .index import URL_KEYS, ResultIndex
+
+    proxy = _expand_proxy_tb_alias(proxy)
+    state_path = os.environ.get("DDGS_STATE")
+    index_path = os.environ.get("DDGS_INDEX")
+    index = ResultIndex(index_path) if index_path and function_name in URL_KEYS else None
+    ddgs_kwargs: dict[str, Any] = {"proxy": proxy, "verify": verify, "index": index}
+    ddgs = DDGS.from_state(state_path, **ddgs_kwargs) if state_path else DDGS(**ddgs_kwargs)
+    search = getattr(ddgs, function_name)
+
+    def run(keywords: str) -> tuple[str, list[dict[str, str]], Exception | None]:
+        try:
+            return keywords, search(keywords=keywords, **kwargs), None
+        except Exception as ex:
+            return keywords, [], ex
+
+    errors: Counter[str] = Counter()
+    searched = results = 0
+    start = time()
+
+    def write(done: set[Future[tuple[str, list[dict[str, str]], Exception | None]]]) -> None:
+        nonlocal searched, results
+        for future in done:
+            keywords, data, ex = future.result()
+            error = f"{type(ex).__name__}: {ex}" if ex else None
+            file.write(json_dumps({"keywords": keywords, "results": data, "error": error}, indent=False) + "\n")
+            file.flush()
+            searched += 1
+            results += len(data)
+            if ex:
+                errors[type(ex).__name__] += 1
+
+    try:
+        with click.open_file(output or "-", "w", encoding="utf-8") as file, ThreadPoolExecutor(workers) as executor:
+            pending: set[Future[tuple[str, list[dict[str, str]], Exception | None]]] = set()
+            for line in keywords_file:
+                if keywords := line.strip():
+                    pending.add(executor.submit(run, keywords))
+                if len(pending) >= 2 * workers:  # read the keywords file lazily
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    write(done)
+            write(wait(pending).done)
+    finally:
+        if state_path:
+            ddgs.save_state(state_path)
+        if index is not None:
+            index.close()
+    elapsed = time() - start
+    click.echo(
+        f"{searched} keywords, {results} results, {sum(errors.values())} errors in {elapsed:.1f}s "
+        f"({searched / elapsed if elapsed else 0:.2f} keywords/s)"
+        + "".join(f", {name}: {count}" for name, count in errors.most_common()),
+        err=True,
+    )
 
 
 def _download_results(
@@ -115,21 +223,22 @@ def _download_results(
     path = pathname if pathname else f"{function_name}_{keywords}_{datetime.now():%Y%m%d_%H%M%S}"
     os.makedirs(path, exist_ok=True)
 
-    threads = 10 if threads is None else threads
-    with ThreadPoolExecutor(max_workers=threads) as executor:
-        futures = []
-        for i, res in enumerate(results, start=1):
-            url = res["image"] if function_name == "images" else res["href"]
-            filename = unquote(url.split("/")[-1].split("?")[0])
-            f = executor.submit(_download_file, url, path, f"{i}_{filename}", proxy, verify)
-            futures.append(f)
+    items = []
+    for i, res in enumerate(results, start=1):
+        url = res["image"] if function_name == "images" else res["href"]
+        filename = unquote(url.split("/")[-1].split("?")[0])
+        items.append((url, os.path.join(path, f"{i}_{filename}"[:200])))
+
+    from .downloads import Downloader
 
-        with click.progressbar(  # type: ignore
-            length=len(futures), label="Downloading", show_percent=True, show_pos=True, width=50
-        ) as bar:
-            for future in as_completed(futures):
-                future.result()
-                bar.update(1)
+    downloader = Downloader(
+        proxy=_expand_proxy_tb_alias(proxy), verify=verify, threads=10 if threads is None else threads
+    )
+    with click.progressbar(  # type: ignore
+        length=len(items), label="Downloading", show_percent=True, show_pos=True, width=50
+    ) as bar:
+        for _url, _status in downloader.download_many(items):
+            bar.update(1)
 
 
 @click.group(chain=True)
@@ -152,12 +261,156 @@ def version() -> str:
 
 
 @cli.command()
-@click.option("-k", "--keywords", required=True, help="text search, keywords for query")
+@click.option(
+    "-s", "--socket", "socket_path", help="unix socket path, default: $DDGS_SOCKET or temp dir/ddgs-<uid>.sock"
+)
+def serve(socket_path: str | None) -> None:
+    """Run a warm DDGS daemon. Search commands are forwarded to it while it is running."""
+    from .daemon import DDGSDaemon
+
+    with DDGSDaemon(socket_path) as daemon:
+        click.echo(f"ddgs daemon is listening on {daemon.socket_path}")
+        with suppress(KeyboardInterrupt):
+            daemon.serve_forever()
+
+
+@cli.command()
+@click.option("-H", "--host", default="127.0.0.1", help="interface to listen on, default=127.0.0.1")
+@click.option("-P", "--port", default=8000, help="port to listen on, default=8000")
+@click.option("-c", "--concurrency", default=2, help="max upstream searches at once, default=2")
+@click.option("-q", "--queue", default=32, help="max searches waiting for a free slot, default=32")
+@click.option("--cache-ttl", default=300, help="seconds to cache results, 0 to disable, default=300")
+@click.option("-p", "--proxy", help="the proxy to send requests, example: socks5://127.0.0.1:9150")
+@click.option("-v", "--verify", default=True, help="verify SSL when making the request")
+def gateway(
+    host: str, port: int, concurrency: int, queue: int, cache_ttl: int, proxy: str | None, verify: bool
+) -> None:
+    """Run a HTTP/JSON search gateway: GET /text, /images, /videos, /news?keywords=..."""
+    from .gateway import DDGSGateway
+
+    with DDGSGateway(
+        host=host,
+        port=port,
+        proxy=_expand_proxy_tb_alias(proxy),
+        verify=verify,
+        max_concurrency=concurrency,
+        max_queue=queue,
+        cache_ttl=cache_ttl,
+    ) as server:
+        click.echo(f"ddgs gateway is listening on http://{host}:{port}")
+        with suppress(KeyboardInterrupt):
+            server.serve_forever()
+
+
+@cli.command()
+@click.option("-u", "--url", help="url of a running stand-in server, default: start one with the options below")
+@click.option("--latency", default=0.05, help="stand-in response latency in seconds, default=0.05")
+@click.option("--jitter", default=0.0, help="max random seconds added to the latency, default=0")
+@click.option("--ratelimit", default=0.0, help="fraction of 202/429 stand-in responses, default=0")
+@click.option("--fixtures", help="directory of recorded responses: vqd.html, html.html, lite.html, i/v/news.json")
+@click.option("--tls", nargs=2, type=click.Path(exists=True), help="certificate and key files, stand-in over https")
+@click.option("--h2", is_flag=True, help="stand-in speaks HTTP/2 too (ALPN or prior knowledge), requires h2")
+@click.option("--http2", is_flag=True, help="DDGS(http2=True): require HTTP/2, fall back to HTTP/1.1")
+@click.option("--mix", help="vertical weights, default: text:3,news:1,images:1,videos:1")
+@click.option("-c", "--concurrency", default="1,2,4", help="comma separated worker counts to sweep, default=1,2,4")
+@click.option("-r", "--rate", type=float, help="queries/s started at a fixed rate (open loop), default: closed loop")
+@click.option("-n", "--queries", default=20, help="queries per concurrency level, default=20")
+@click.option("-i", "--interval", default=0.75, help="pacing interval in seconds, default=0.75")
+@click.option("-m", "--max_results", type=int, help="max_results of the queries, default: one page")
+@click.option("-b", "--backend", default="auto", type=click.Choice(["auto", "html", "lite"]))
+@click.option("-p", "--proxy", help="the proxy to send requests, example: socks5://127.0.0.1:9150")
+@click.option("-o", "--output", help="save the reports to a json file")
+@click.option("--seed", type=int, help="seed of the query mix, latency jitter and ratelimits")
+def bench(
+    url: str | None,
+    latency: float,
+    jitter: float,
+    ratelimit: float,
+    fixtures: str | None,
+    tls: tuple[str, str] | None,
+    h2: bool,
+    http2: bool,
+    mix: str | None,
+    concurrency: str,
+    rate: float | None,
+    queries: int,
+    interval: float,
+    max_results: int | None,
+    backend: str,
+    proxy: str | None,
+    output: str | None,
+    seed: int | None,
+) -> None:
+    """Load test a DDGS configuration against a local stand-in server: throughput, latency, where the time goes."""
+    from .bench import BENCH_MIX, StandInServer, run_bench
+
+    reports = []
+    server: StandInServer | None = None
+    if url is None:  # the stand-in options are ignored with --url
+        certfile, keyfile = tls or (None, None)
+        server = StandInServer(
+            latency=latency,
+            jitter=jitter,
+            ratelimit=ratelimit,
+            fixtures_dir=fixtures,
+            seed=seed,
+            certfile=certfile,
+            keyfile=keyfile,
+            http2=h2,
+        )
+        url = server.url
+    with server if server is not None else nullcontext():
+        click.echo(
+            f"{'workers':>7} {'queries':>7} {'ok':>5} {'429':>5} {'err':>5} {'q/s':>6} {'p50':>7} {'p95':>7}"
+            f" {'p99':>7} {'sleep':>7} {'network':>7} {'parse':>7} {'queue':>7}  connections"
+        )
+        for workers in (int(c) for c in concurrency.split(",")):
+            if server is not None:
+                connections = server.connections.copy()
+            report = run_bench(
+                url,
+                mix or BENCH_MIX,
+                workers,
+                queries,
+                rate,
+                interval,
+                max_results,
+                backend,
+                _expand_proxy_tb_alias(proxy),
+                seed,
+                verify=tls is None,
+                http2=http2,
+            )
+            if server is not None:
+                report["connections"] = dict(server.connections - connections)
+            reports.append(report)
+            click.echo(
+                f"{workers:>7} {report['queries']:>7} {report['ok']:>5} {report['ratelimited']:>5}"
+                f" {report['errors']:>5} {report['throughput']:>6.2f}"
+                + "".join(f" {report[k]:>6.3f}s" for k in ("p50", "p95", "p99", "sleep", "network", "parse", "queue"))
+                + "  "
+                + " ".join(f"{protocol}:{n}" for protocol, n in sorted(report.get("connections", {}).items()))
+            )
+        if server is not None:
+            click.echo(f"stand-in server: {server.requests} requests, {server.ratelimited} ratelimited")
+    if output:
+        _save_json(output, reports)
+
+
+@cli.command()
+@click.option("-k", "--keywords", help="text search, keywords for query")
+@click.option(
+    "-K",
+    "--keywords-file",
+    type=click.File("r", encoding="utf-8"),
+    help="file with one query per line or - for stdin, JSON lines of results are written to -o or stdout",
+)
+@click.option("-w", "--workers", default=4, type=click.IntRange(min=1), help="parallel searches with -K, default=4")
 @click.option("-r", "--region", help="us-en, ru-ru, etc. -region https://duckduckgo.com/params")
 @click.option("-s", "--safesearch", default="moderate", type=click.Choice(["on", "moderate", "off"]))
 @click.option("-t", "--timelimit", type=click.Choice(["d", "w", "m", "y"]), help="day, week, month, year")
 @click.option("-m", "--max_results", type=int, help="maximum number of results")
-@click.option("-o", "--output", help="csv, json or filename.csv|json (save the results to a csv or json file)")
+@click.option("-o", "--output", help="csv, json or filename.csv|json to save the results, filename.jsonl with -K")
 @click.option("-d", "--download", is_flag=True, default=False, help="download results. -dd to set custom directory")
 @click.option("-dd", "--download-directory", help="Specify custom download directory")
 @click.option("-b", "--backend", default="auto", type=click.Choice(["auto", "html", "lite"]))
@@ -165,7 +418,9 @@ def version() -> str:
 @click.option("-p", "--proxy", help="the proxy to send requests, example: socks5://127.0.0.1:9150")
 @click.option("-v", "--verify", default=True, help="verify SSL when making the request")
 def text(
-    keywords: str,
+    keywords: str | None,
+    keywords_file: TextIO | None,
+    workers: int,
     region: str | None,
     safesearch: str,
     timelimit: str | None,
@@ -179,14 +434,18 @@ def text(
     verify: bool,
 ) -> None:
     """CLI function to perform a text search using DuckDuckGo API."""
-    data = DDGS(proxy=_expand_proxy_tb_alias(proxy), verify=verify).text(
-        keywords=keywords,
-        region=region,
-        safesearch=safesearch,
-        timelimit=timelimit,
-        backend=backend,
-        max_results=max_results,
-    )
+    keywords = _check_keywords(keywords, keywords_file, output, download)
+    kwargs = {
+        "region": region,
+        "safesearch": safesearch,
+        "timelimit": timelimit,
+        "backend": backend,
+        "max_results": max_results,
+    }
+    if keywords_file:
+        _bulk_search("text", keywords_file, workers, output, proxy, verify, **kwargs)
+        return
+    data = _search("text", proxy, verify, keywords=keywords, **kwargs)
     keywords = _sanitize_keywords(keywords)
     if output:
         _save_data(keywords, data, "text", filename=output)
@@ -205,7 +464,14 @@ def text(
 
 
 @cli.command()
-@click.option("-k", "--keywords", required=True, help="keywords for query")
+@click.option("-k", "--keywords", help="keywords for query")
+@click.option(
+    "-K",
+    "--keywords-file",
+    type=click.File("r", encoding="utf-8"),
+    help="file with one query per line or - for stdin, JSON lines of results are written to -o or stdout",
+)
+@click.option("-w", "--workers", default=4, type=click.IntRange(min=1), help="parallel searches with -K, default=4")
 @click.option("-r", "--region", default="us-en", help="us-en, ru-ru, etc. -region https://duckduckgo.com/params")
 @click.option("-s", "--safesearch", default="moderate", type=click.Choice(["on", "moderate", "off"]))
 @click.option("-t", "--timelimit", type=click.Choice(["Day", "Week", "Month", "Year"]))
@@ -240,14 +506,16 @@ def text(
     type=click.Choice(["any", "Public", "Share", "ShareCommercially", "Modify", "ModifyCommercially"]),
 )
 @click.option("-m", "--max_results", type=int, help="maximum number of results")
-@click.option("-o", "--output", help="csv, json or filename.csv|json (save the results to a csv or json file)")
+@click.option("-o", "--output", help="csv, json or filename.csv|json to save the results, filename.jsonl with -K")
 @click.option("-d", "--download", is_flag=True, default=False, help="download results. -dd to set custom directory")
 @click.option("-dd", "--download-directory", help="Specify custom download directory")
 @click.option("-th", "--threads", default=10, help="download threads, default=10")
 @click.option("-p", "--proxy", help="the proxy to send requests, example: socks5://127.0.0.1:9150")
 @click.option("-v", "--verify", default=True, help="verify SSL when making the request")
 def images(
-    keywords: str,
+    keywords: str | None,
+    keywords_file: TextIO | None,
+    workers: int,
     region: str,
     safesearch: str,
     timelimit: str | None,
@@ -265,18 +533,22 @@ def images(
     verify: bool,
 ) -> None:
     """CLI function to perform a images search using DuckDuckGo API."""
-    data = DDGS(proxy=_expand_proxy_tb_alias(proxy), verify=verify).images(
-        keywords=keywords,
-        region=region,
-        safesearch=safesearch,
-        timelimit=timelimit,
-        size=size,
-        color=color,
-        type_image=type_image,
-        layout=layout,
-        license_image=license_image,
-        max_results=max_results,
-    )
+    keywords = _check_keywords(keywords, keywords_file, output, download)
+    kwargs = {
+        "region": region,
+        "safesearch": safesearch,
+        "timelimit": timelimit,
+        "size": size,
+        "color": color,
+        "type_image": type_image,
+        "layout": layout,
+        "license_image": license_image,
+        "max_results": max_results,
+    }
+    if keywords_file:
+        _bulk_search("images", keywords_file, workers, output, proxy, verify, **kwargs)
+        return
+    data = _search("images", proxy, verify, keywords=keywords, **kwargs)
     keywords = _sanitize_keywords(keywords)
     if output:
         _save_data(keywords, data, function_name="images", filename=output)
@@ -295,7 +567,14 @@ def images(
 
 
 @cli.command()
-@click.option("-k", "--keywords", required=True, help="keywords for query")
+@click.option("-k", "--keywords", help="keywords for query")
+@click.option(
+    "-K",
+    "--keywords-file",
+    type=click.File("r", encoding="utf-8"),
+    help="file with one query per line or - for stdin, JSON lines of results are written to -o or stdout",
+)
+@click.option("-w", "--workers", default=4, type=click.IntRange(min=1), help="parallel searches with -K, default=4")
 @click.option("-r", "--region", default="us-en", help="us-en, ru-ru, etc. -region https://duckduckgo.com/params")
 @click.option("-s", "--safesearch", default="moderate", type=click.Choice(["on", "moderate", "off"]))
 @click.option("-t", "--timelimit", type=click.Choice(["d", "w", "m"]), help="day, week, month")
@@ -303,11 +582,13 @@ def images(
 @click.option("-d", "--duration", type=click.Choice(["short", "medium", "long"]))
 @click.option("-lic", "--license_videos", type=click.Choice(["creativeCommon", "youtube"]))
 @click.option("-m", "--max_results", type=int, help="maximum number of results")
-@click.option("-o", "--output", help="csv, json or filename.csv|json (save the results to a csv or json file)")
+@click.option("-o", "--output", help="csv, json or filename.csv|json to save the results, filename.jsonl with -K")
 @click.option("-p", "--proxy", help="the proxy to send requests, example: socks5://127.0.0.1:9150")
 @click.option("-v", "--verify", default=True, help="verify SSL when making the request")
 def videos(
-    keywords: str,
+    keywords: str | None,
+    keywords_file: TextIO | None,
+    workers: int,
     region: str,
     safesearch: str,
     timelimit: str | None,
@@ -320,16 +601,20 @@ def videos(
     verify: bool,
 ) -> None:
     """CLI function to perform a videos search using DuckDuckGo API."""
-    data = DDGS(proxy=_expand_proxy_tb_alias(proxy), verify=verify).videos(
-        keywords=keywords,
-        region=region,
-        safesearch=safesearch,
-        timelimit=timelimit,
-        resolution=resolution,
-        duration=duration,
-        license_videos=license_videos,
-        max_results=max_results,
-    )
+    keywords = _check_keywords(keywords, keywords_file, output)
+    kwargs = {
+        "region": region,
+        "safesearch": safesearch,
+        "timelimit": timelimit,
+        "resolution": resolution,
+        "duration": duration,
+        "license_videos": license_videos,
+        "max_results": max_results,
+    }
+    if keywords_file:
+        _bulk_search("videos", keywords_file, workers, output, proxy, verify, **kwargs)
+        return
+    data = _search("videos", proxy, verify, keywords=keywords, **kwargs)
     keywords = _sanitize_keywords(keywords)
     if output:
         _save_data(keywords, data, function_name="videos", filename=output)
@@ -338,16 +623,25 @@ def videos(
 
 
 @cli.command()
-@click.option("-k", "--keywords", required=True, help="keywords for query")
+@click.option("-k", "--keywords", help="keywords for query")
+@click.option(
+    "-K",
+    "--keywords-file",
+    type=click.File("r", encoding="utf-8"),
+    help="file with one query per line or - for stdin, JSON lines of results are written to -o or stdout",
+)
+@click.option("-w", "--workers", default=4, type=click.IntRange(min=1), help="parallel searches with -K, default=4")
 @click.option("-r", "--region", default="us-en", help="us-en, ru-ru, etc. -region https://duckduckgo.com/params")
 @click.option("-s", "--safesearch", default="moderate", type=click.Choice(["on", "moderate", "off"]))
 @click.option("-t", "--timelimit", type=click.Choice(["d", "w", "m", "y"]), help="day, week, month, year")
 @click.option("-m", "--max_results", type=int, help="maximum number of results")
-@click.option("-o", "--output", help="csv, json or filename.csv|json (save the results to a csv or json file)")
+@click.option("-o", "--output", help="csv, json or filename.csv|json to save the results, filename.jsonl with -K")
 @click.option("-p", "--proxy", help="the proxy to send requests, example: socks5://127.0.0.1:9150")
 @click.option("-v", "--verify", default=True, help="verify SSL when making the request")
 def news(
-    keywords: str,
+    keywords: str | None,
+    keywords_file: TextIO | None,
+    workers: int,
     region: str,
     safesearch: str,
     timelimit: str | None,
@@ -357,9 +651,12 @@ def news(
     verify: bool,
 ) -> None:
     """CLI function to perform a news search using DuckDuckGo API."""
-    data = DDGS(proxy=_expand_proxy_tb_alias(proxy), verify=verify).news(
-        keywords=keywords, region=region, safesearch=safesearch, timelimit=timelimit, max_results=max_results
-    )
+    keywords = _check_keywords(keywords, keywords_file, output)
+    kwargs = {"region": region, "safesearch": safesearch, "timelimit": timelimit, "max_results": max_results}
+    if keywords_file:
+        _bulk_search("news", keywords_file, workers, output, proxy, verify, **kwargs)
+        return
+    data = _search("news", proxy, verify, keywords=keywords, **kwargs)
     keywords = _sanitize_keywords(keywords)
     if output:
         _save_data(keywords, data, function_name="news", filename=output)
@@ -367,5 +664,23 @@ def news(
         _print_data(data)
 
 
+@cli.command()
+@click.option("-k", "--keywords", required=True, help="words that must all appear in the results")
+@click.option("-i", "--index", "index_path", envvar="DDGS_INDEX", required=True, help="index path, default=$DDGS_INDEX")
+@click.option("-V", "--vertical", type=click.Choice(["text", "news"]), help="text or news, default: both")
+@click.option("-m", "--max_results", type=int, help="maximum number of results")
+@click.option("-o", "--output", help="csv, json or filename.csv|json (save the results to a csv or json file)")
+def local(keywords: str, index_path: str, vertical: str | None, max_results: int | None, output: str | None) -> None:
+    """Search the text and news results collected in the local index, without any request."""
+    from .index import ResultIndex
+
+    with ResultIndex(index_path) as index:
+        data = index.search(keywords, vertical, max_results)
+    if output:
+        _save_data(_sanitize_keywords(keywords), data, function_name="local", filename=output)
+    else:
+        _print_data(data)
+
+
 if __name__ == "__main__":
     cli(prog_name="ddgs")
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+from typing import Any
+
+from . import exceptions
+from .duckduckgo_search import DDGS
+from .exceptions import DuckDuckGoSearchException
+from .utils import json_dumps, json_loads
+
+logger = logging.getLogger("duckduckgo_search.daemon")
+
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+METHODS = ("text", "images", "videos", "news")
+if sys.platform != "win32":
+    _ServerBase = socketserver.ThreadingUnixStreamServer
+else:  # no unix sockets: DDGSDaemon() raises, daemon_request() returns None
+    _ServerBase = socketserver.ThreadingTCPServer
+DAEMON_TIMEOUT = 120  # seconds to wait for the daemon before searching in-process
+
+
+def default_socket_path() -> str:
+    """Get the daemon socket path: $DDGS_SOCKET or a per-user socket in the temp directory."""
+    ddgs_socket = os.environ.get("DDGS_SOCKET")
+    if ddgs_socket:
+        return ddgs_socket
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "")
+    return os.path.join(tempfile.gettempdir(), f"ddgs-{user}.sock")
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """Handle a single request: read the json payload until EOF, write back the json response."""
+
+    server: DDGSDaemon
+
+    def handle(self) -> None:
+        response: dict[str, Any]
+        try:
+            request = json_loads(self.rfile.read())
+            response = {"results": self.server.dispatch(request)}
+        except Exception as ex:
+            logger.info(f"daemon request failed: {type(ex).__name__}: {ex}")
+            response = {"error": type(ex).__name__, "message": str(ex)}
+        self.wfile.write(json_dumps(response).encode())
+
+
+class DDGSDaemon(_ServerBase):
+    """Unix socket server that keeps warm DDGS instances (client, cookies, pacing state) between CLI calls."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str | None = None) -> None:
+        """Initialize the daemon and bind the unix socket.
+
+        Args:
+            socket_path: path of the unix socket. Defaults to $DDGS_SOCKET or ddgs-<uid>.sock in the temp directory.
+        """
+        if not HAS_UNIX_SOCKETS:
+            raise DuckDuckGoSearchException("ddgs daemon requires unix sockets support")
+        self.socket_path = socket_path or default_socket_path()
+        if os.path.exists(self.socket_path):
+            if _is_listening(self.socket_path):
+                raise DuckDuckGoSearchException(f"ddgs daemon is already running on {self.socket_path}")
+            os.unlink(self.socket_path)  # stale socket left by a killed daemon
+        self.engines: dict[tuple[str | None, bool], DDGS] = {}
+        self._engines_lock = threading.Lock()
+        super().__init__(self.socket_path, _DaemonHandler)
+        os.chmod(self.socket_path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def get_engine(self, proxy: str | None, verify: bool) -> DDGS:
+        """Get the warm DDGS instance for the given client settings, creating it on first use."""
+        key = (proxy, verify)
+        with self._engines_lock:
+            if key not in self.engines:
+                self.engines[key] = DDGS(proxy=proxy, verify=verify)
+            return self.engines[key]
+
+    def dispatch(self, request: dict[str, Any]) -> list[dict[str, str]]:
+        """Run the requested DDGS method on the warm engine.
+
+        Concurrent calls share the engine: its pacing is thread-safe and identical searches are coalesced.
+        """
+        method = request.get("method")
+        if method not in METHODS:
+            raise DuckDuckGoSearchException(f"Unsupported daemon method: {method}")
+        ddgs = self.get_engine(request.get("proxy"), request.get("verify", True))
+        results: list[dict[str, str]] = getattr(ddgs, method)(**request.get("kwargs", {}))
+        return results
+
+
+def _is_listening(socket_path: str) -> bool:
+    """Check if a daemon accepts connections on the socket path."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def daemon_request(
+    method: str,
+    kwargs: dict[str, Any],
+    proxy: str | None = None,
+    verify: bool = True,
+    socket_path: str | None = None,
+    timeout: float | None = DAEMON_TIMEOUT,
+) -> list[dict[str, str]] | None:
+    """Forward a search to the running daemon.
+
+    Args:
+        method: DDGS method name: text, images, videos, news.
+        kwargs: keyword arguments for the method.
+        proxy: proxy of the DDGS instance that should run the search. Defaults to None.
+        verify: SSL verification of the DDGS instance that should run the search. Defaults to True.
+        socket_path: path of the unix socket. Defaults to $DDGS_SOCKET or ddgs-<uid>.sock in the temp directory.
+        timeout: seconds to wait for the daemon, None to wait forever. Defaults to DAEMON_TIMEOUT.
+
+    Returns:
+        List of dictionaries with search results, or None if no daemon is running or it timed out.
+
+    Raises:
+        DuckDuckGoSearchException: the error raised by the daemon, re-raised with the same exception class.
+    """
+    socket_path = socket_path or default_socket_path()
+    if not HAS_UNIX_SOCKETS or not os.path.exists(socket_path):
+        return None
+    payload = {"method": method, "kwargs": kwargs, "proxy": proxy, "verify": verify}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path)
+        except OSError as ex:
+            logger.debug(f"daemon is not available on {socket_path}: {ex}")
+            return None
+        try:
+            sock.sendall(json_dumps(payload).encode())
+            sock.shutdown(socket.SHUT_WR)
+            resp_content = b"".join(iter(lambda: sock.recv(65536), b""))
+        except socket.timeout:
+            logger.warning(f"daemon on {socket_path} did not answer in {timeout}s, searching in-process")
+            return None
+
+    response = json_loads(resp_content)
+    if "error" in response:
+        exc_class = getattr(exceptions, response["error"], None)
+        if isinstance(exc_class, type) and issubclass(exc_class, DuckDuckGoSearchException):
+            raise exc_class(response["message"])
+        raise DuckDuckGoSearchException(f"{response['error']}: {response['message']}")
+    results: list[dict[str, str]] = response["results"]
+    return results
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from random import random
+from time import monotonic, sleep
+from typing import Any, Callable, Literal, TypeVar
+from urllib.parse import urlsplit
+
+import primp
+
+from .exceptions import DuckDuckGoSearchException
+from .utils import json_dumps, json_loads
+
+logger = logging.getLogger("duckduckgo_search.downloads")
+
+MANIFEST_FILENAME = ".ddgs_downloads.json"
+RETRY_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+T = TypeVar("T")
+DownloadStatus = Literal["downloaded", "resumed", "skipped", "duplicate"]
+
+
+class _RetryableError(DuckDuckGoSearchException):
+    """Download error worth retrying: network errors, 429 and 5xx responses."""
+
+
+class Downloader:
+    """Download manager: pooled clients, streamed writes, per-host limits, retries, resume and dedup.
+
+    Every worker thread reuses its own impersonating client. Response bodies are streamed to `<file>.part`
+    in chunks and renamed when complete, interrupted downloads are resumed with a Range request.
+    Finished files are recorded in a manifest in the download directory: files that are already there
+    are skipped, files with the same content hash as an earlier download are removed as duplicates.
+    """
+
+    def __init__(
+        self,
+        proxy: str | None = None,
+        verify: bool = True,
+        timeout: int = 10,
+        threads: int = 10,
+        per_host: int = 4,
+        retries: int = 3,
+        backoff: float = 1.0,
+        chunk_size: int = 65536,
+        max_size: int | None = None,
+        max_time: float | None = None,
+    ) -> None:
+        """Initialize the Downloader.
+
+        Args:
+            proxy: proxy for the HTTP clients, supports http/https/socks5 protocols. Defaults to None.
+            verify: SSL verification when making the request. Defaults to True.
+            timeout: timeout value for the HTTP clients. Defaults to 10.
+            threads: number of download threads. Defaults to 10.
+            per_host: max number of concurrent downloads from the same host. Defaults to 4.
+            retries: max number of retries after network errors, 429 and 5xx responses. Defaults to 3.
+            backoff: base of the exponential backoff between retries, in seconds. Defaults to 1.0.
+            chunk_size: size of the chunks written to disk, in bytes. Defaults to 65536.
+            max_size: max size of a file in bytes, larger downloads are aborted. Defaults to None.
+            max_time: max seconds to read a response body, slower downloads are aborted. Defaults to None.
+        """
+        self.proxy = proxy
+        self.verify = verify
+        self.timeout = timeout
+        self.threads = threads
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self.max_time = max_time
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._manifests: dict[str, dict[str, dict[str, Any]]] = {}
+
+    def _client(self) -> primp.Client:
+        """Get the HTTP client of the current thread."""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = primp.Client(
+                proxy=self.proxy,
+                timeout=self.timeout,
+                impersonate="random",
+                impersonate_os="random",
+                verify=self.verify,
+            )
+        return client
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _manifest(self, dir_path: str) -> dict[str, dict[str, Any]]:
+        """Get the manifest of the download directory. Call with the lock held."""
+        if dir_path not in self._manifests:
+            manifest_path = os.path.join(dir_path, MANIFEST_FILENAME)
+            try:
+                with open(manifest_path, "rb") as file:
+                    self._manifests[dir_path] = json_loads(file.read())
+            except (OSError, DuckDuckGoSearchException):
+                self._manifests[dir_path] = {}
+        return self._manifests[dir_path]
+
+    def _save_manifest(self, dir_path: str) -> None:
+        """Write the manifest of the download directory. Call with the lock held."""
+        manifest_path = os.path.join(dir_path, MANIFEST_FILENAME)
+        with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as file:
+            file.write(json_dumps(self._manifests[dir_path]))
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    def download(self, url: str, path: str | os.PathLike[str]) -> DownloadStatus:
+        """Download url to path.
+
+        Args:
+            url: url of the file.
+            path: destination file path.
+
+        Returns:
+            "downloaded", "resumed" (a partial download was completed), "skipped" (the file is already
+            downloaded) or "duplicate" (same content as an earlier download, the new file is removed).
+
+        Raises:
+            DuckDuckGoSearchException: if the download failed after all retries.
+        """
+        path = os.fspath(path)
+        dir_path, filename = os.path.split(os.path.abspath(path))
+        with self._lock:
+            entry = self._manifest(dir_path).get(filename, {})
+        exists = os.path.exists(path)
+        if entry.get("url") == url and (
+            entry.get("duplicate_of") or (exists and os.path.getsize(path) == entry.get("size"))
+        ):
+            return "skipped"
+        if not entry and exists and os.path.getsize(path):
+            return "skipped"  # downloaded before the manifest was written
+
+        try:
+            status, size, etag, sha256 = self._retry(url, lambda: self._stream_to_file(url, path))
+        except DuckDuckGoSearchException:
+            if os.path.exists(f"{path}.part"):
+                with self._lock:
+                    self._save_manifest(dir_path)  # keep the etag of the partial download for If-Range
+            raise
+
+        with self._lock:
+            manifest = self._manifest(dir_path)
+            duplicate_of = next(
+                (
+                    k
+                    for k, v in manifest.items()
+                    if k != filename and v.get("sha256") == sha256 and os.path.exists(os.path.join(dir_path, k))
+                ),
+                None,
+            )
+            if duplicate_of:
+                os.remove(path)
+                manifest[filename] = {"url": url, "sha256": sha256, "duplicate_of": duplicate_of}
+                status = "duplicate"
+            else:
+                manifest[filename] = {"url": url, "size": size, "etag": etag, "sha256": sha256}
+            self._save_manifest(dir_path)
+        return status
+
+    def _stream_to_file(self, url: str, path: str) -> tuple[DownloadStatus, int, str | None, str]:
+        """Stream the response body to path.part, resuming a partial download, then rename it to path.
+
+        The Range request carries the etag that the attempt which started path.part recorded in the manifest.
+        A 416 response means that path.part already holds the whole file, unless its Content-Range disagrees:
+        then path.part is dropped and the file is downloaded again.
+
+        Returns:
+            Tuple (status, size, etag, sha256 hexdigest).
+        """
+        part_path = f"{path}.part"
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        dir_path, filename = os.path.split(os.path.abspath(path))
+        with self._lock:
+            entry = self._manifest(dir_path).get(filename, {})
+        etag = entry.get("etag") if entry.get("partial") and entry.get("url") == url else None
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        if offset and etag:
+            headers["If-Range"] = etag
+        resp = self._request(url, headers)
+        if resp.status_code == 416 and resp.headers.get("content-range") != f"bytes */{offset}":
+            resp.close()
+            logger.debug(f"{url} rejected the range of {part_path}, download it again")
+            os.remove(part_path)
+            offset = 0
+            resp = self._request(url)
+        try:
+            complete = resp.status_code == 416  # path.part already holds the whole file
+            resumed = offset > 0 and resp.status_code in (206, 416)
+            etag = etag if complete else resp.headers.get("etag")
+            if etag:
+                with self._lock:
+                    self._manifest(dir_path)[filename] = {"url": url, "etag": etag, "partial": True}
+            size = offset if resumed else 0
+            sha256 = hashlib.sha256()
+            if resumed:
+                with open(part_path, "rb") as file:
+                    for chunk in iter(lambda: file.read(self.chunk_size), b""):
+                        sha256.update(chunk)
+            with open(part_path, "ab" if resumed else "wb") as file:
+                for chunk in () if complete else self._iter_chunks(resp, url, size):
+                    size += len(chunk)
+                    sha256.update(chunk)
+                    file.write(chunk)
+        except DuckDuckGoSearchException as ex:
+            if not isinstance(ex, _RetryableError) and os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        finally:
+            resp.close()
+
+        os.replace(part_path, path)
+        return ("resumed" if resumed else "downloaded"), size, etag, sha256.hexdigest()
+
+    def fetch(self, url: str) -> bytes:
+        """Fetch url into memory, with the per-host limit, retries and max_size of the downloader.
+
+        Raises:
+            DuckDuckGoSearchException: if the fetch failed after all retries or the body exceeds max_size.
+        """
+
+        def fetch_once() -> bytes:
+            resp = self._request(url)
+            try:
+                if resp.status_code != 200:
+                    raise DuckDuckGoSearchException(f"fetch {url} status code {resp.status_code}")
+                return b"".join(self._iter_chunks(resp, url))
+            finally:
+                resp.close()
+
+        return self._retry(url, fetch_once)
+
+    def _retry(self, url: str, func: Callable[[], T]) -> T:
+        """Call func() holding a slot of the url host, retry _RetryableError with exponential backoff."""
+        for attempt in range(self.retries + 1):
+            try:
+                with self._host_slot(url):
+                    return func()
+            except _RetryableError as ex:
+                if attempt == self.retries:
+                    raise DuckDuckGoSearchException(f"{url} failed after {attempt + 1} attempts: {ex}") from ex
+                delay = self.backoff * 2**attempt * (0.5 + random())
+                logger.debug(f"{url} {ex}, retry in {delay:.2f}s")
+                sleep(delay)
+        raise AssertionError("unreachable")
+
+    def _request(self, url: str, headers: dict[str, str] | None = None) -> primp.Response:
+        """Send a streaming GET request, raise _RetryableError for network errors, 429 and 5xx responses."""
+        try:
+            resp = self._client().request("GET", url, headers=headers, stream=True)
+        except Exception as ex:
+            raise _RetryableError(f"{type(ex).__name__}: {ex}") from ex
+        if resp.status_code in RETRY_STATUS_CODES:
+            resp.close()
+            raise _RetryableError(f"status code {resp.status_code}")
+        if resp.status_code == 416 and headers and "Range" in headers:
+            return resp  # range not satisfiable, handled by _stream_to_file()
+        if resp.status_code not in (200, 206):
+            resp.close()
+            raise DuckDuckGoSearchException(f"{url} status code {resp.status_code}")
+        return resp
+
+    def _iter_chunks(self, resp: primp.Response, url: str, offset: int = 0) -> Iterator[bytes]:
+        """Iterate over the response body chunks, enforcing max_size and max_time."""
+        size = offset + int(resp.headers.get("content-length", 0))
+        if self.max_size and size > self.max_size:
+            raise DuckDuckGoSearchException(f"{url} is larger than {self.max_size} bytes")
+        size = offset
+        deadline = monotonic() + self.max_time if self.max_time else None
+        try:
+            for chunk in resp.iter_bytes(self.chunk_size):
+                size += len(chunk)
+                if self.max_size and size > self.max_size:
+                    raise DuckDuckGoSearchException(f"{url} is larger than {self.max_size} bytes")
+                if deadline and monotonic() > deadline:
+                    raise DuckDuckGoSearchException(f"{url} took longer than {self.max_time} seconds")
+                yield chunk
+        except DuckDuckGoSearchException:
+            raise
+        except Exception as ex:
+            raise _RetryableError(f"{type(ex).__name__}: {ex}") from ex
+
+    def download_many(
+        self, items: Iterable[tuple[str, str | os.PathLike[str]]]
+    ) -> Iterator[tuple[str, DownloadStatus | Exception]]:
+        """Download (url, path) items in the thread pool.
+
+        Yields:
+            Tuples (url, status or exception) in completion order.
+        """
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            futures = {executor.submit(self.download, url, path): url for url, path in items}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    yield url, future.result()
+                except Exception as ex:
+                    logger.debug(f"download {url} {type(ex).__name__}: {ex}")
+                    yield url, ex
@@ -12,3 +12,7 @@ class TimeoutException(DuckDuckGoSearchException):
 
 class ConversationLimitException(DuckDuckGoSearchException):
     """Raised for conversation limit during API requests to AI endpoint."""
+
+
+class GatewayBusyException(DuckDuckGoSearchException):
+    """Raised when the search gateway queue is full or a request waited too long for a free slot."""
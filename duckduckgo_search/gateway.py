@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import inspect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from .duckduckgo_search import DDGS
+from .exceptions import GatewayBusyException, RatelimitException, TimeoutException
+from .scheduler import PRIORITY_SHARES, RequestScheduler
+from .utils import _SingleFlight, _TTLCache, json_dumps
+
+logger = logging.getLogger("duckduckgo_search.gateway")
+
+METHODS = ("text", "images", "videos", "news")
+INT_PARAMS = frozenset({"max_results"})
+FLOAT_PARAMS = frozenset({"time_budget"})
+LIST_PARAMS = frozenset({"fields"})  # comma separated
+
+
+class _GatewayHandler(BaseHTTPRequestHandler):
+    """Serve GET /text, /images, /videos, /news with query string params of the DDGS methods.
+
+    The optional `priority` ("interactive" or "bulk") and `tenant` params select the scheduling class.
+    Results cut short by the `time_budget` param are sent with an `X-DDGS-Partial: 1` header.
+    GET /stats returns the scheduler stats and the ratelimit stats of the impersonation profiles.
+    """
+
+    server: DDGSGateway
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        method = url.path.strip("/")
+        if method == "stats":
+            self._send_json(200, self.server.stats())
+            return
+        if method not in METHODS:
+            self._send_json(404, {"error": f"Unknown endpoint: {url.path}"})
+            return
+        params = parse_qsl(url.query)
+        priority = next((v for k, v in params if k == "priority"), "interactive")
+        tenant = next((v for k, v in params if k == "tenant"), "default")
+        try:
+            if priority not in PRIORITY_SHARES:
+                raise ValueError(f"Unknown priority: {priority}")
+            kwargs = self.server.parse_params(method, [(k, v) for k, v in params if k not in ("priority", "tenant")])
+        except ValueError as ex:
+            self._send_json(400, {"error": str(ex)})
+            return
+        try:
+            results = self.server.search(method, kwargs, priority, tenant)
+            self._send_json(200, results, {"X-DDGS-Partial": "1"} if getattr(results, "partial", False) else None)
+        except ValueError as ex:
+            self._send_json(400, {"error": str(ex)})
+        except GatewayBusyException as ex:
+            self._send_json(503, {"error": str(ex)}, {"Retry-After": "1"})
+        except RatelimitException as ex:
+            self._send_json(429, {"error": str(ex)})
+        except TimeoutException as ex:
+            self._send_json(504, {"error": str(ex)})
+        except Exception as ex:
+            self._send_json(502, {"error": f"{type(ex).__name__}: {ex}"})
+
+    def _send_json(self, status: int, data: Any, headers: dict[str, str] | None = None) -> None:
+        body = json_dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class DDGSGateway(ThreadingHTTPServer):
+    """HTTP/JSON search gateway: many clients share one paced and cached DDGS instance.
+
+    Identical in-flight requests are coalesced into one upstream search. At most `max_concurrency` searches
+    run upstream at once per priority class, up to `max_queue` more wait for a slot, the rest are rejected
+    with 503. All upstream requests go through one RequestScheduler, so interactive searches keep a low
+    latency while bulk searches are running.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        proxy: str | None = None,
+        verify: bool = True,
+        max_concurrency: int = 2,
+        max_queue: int = 32,
+        queue_timeout: float = 30,
+        cache_ttl: float = 300,
+        cache_size: int = 1024,
+    ) -> None:
+        """Initialize the gateway and bind the http server.
+
+        Args:
+            host: interface to listen on. Defaults to "127.0.0.1".
+            port: port to listen on. Defaults to 8000.
+            proxy: proxy for the shared DDGS instance. Defaults to None.
+            verify: SSL verification of the shared DDGS instance. Defaults to True.
+            max_concurrency: max number of upstream searches of a priority class running at once. Defaults to 2.
+            max_queue: max number of searches waiting for a free slot. Defaults to 32.
+            queue_timeout: max seconds a search waits for a free slot. Defaults to 30.
+            cache_ttl: seconds to keep results in cache, 0 disables caching. Defaults to 300.
+            cache_size: max number of cached results. Defaults to 1024.
+        """
+        self.proxy = proxy
+        self.verify = verify
+        self.scheduler = RequestScheduler()
+        self.ddgs = DDGS(
+            proxy=proxy, verify=verify, impersonate="adaptive", impersonate_os="adaptive", scheduler=self.scheduler
+        )
+        self.engines: dict[str, DDGS] = {"interactive": self.ddgs}
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.cache_ttl = cache_ttl
+        self.cache: _TTLCache[list[dict[str, str]]] = _TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.single_flight: _SingleFlight[list[dict[str, str]]] = _SingleFlight()
+        self._slots = {priority: threading.BoundedSemaphore(max_concurrency) for priority in PRIORITY_SHARES}
+        self._engines_lock = threading.Lock()
+        self._waiting = 0
+        self._waiting_lock = threading.Lock()
+        super().__init__((host, port), _GatewayHandler)
+
+    def parse_params(self, method: str, params: list[tuple[str, str]]) -> dict[str, Any]:
+        """Validate query string params against the DDGS method signature."""
+        allowed = inspect.signature(getattr(DDGS, method)).parameters
+        kwargs: dict[str, Any] = {}
+        for k, v in params:
+            if k == "self" or k not in allowed:
+                raise ValueError(f"Unknown parameter: {k}")
+            if k in INT_PARAMS:
+                try:
+                    kwargs[k] = int(v)
+                except ValueError:
+                    raise ValueError(f"Parameter {k} must be an integer") from None
+            elif k in FLOAT_PARAMS:
+                try:
+                    kwargs[k] = float(v)
+                except ValueError:
+                    raise ValueError(f"Parameter {k} must be a number") from None
+            elif k in LIST_PARAMS:
+                kwargs[k] = [item for item in v.split(",") if item]
+            else:
+                kwargs[k] = v
+        if not kwargs.get("keywords"):
+            raise ValueError("Parameter keywords is mandatory")
+        return kwargs
+
+    def get_engine(self, priority: str) -> DDGS:
+        """Get the DDGS instance of a priority class, they all share the scheduler.
+
+        Tenants do not get their own instance: the tenant of a search is set per request with DDGS.as_tenant().
+        """
+        with self._engines_lock:
+            if priority not in self.engines:
+                self.engines[priority] = DDGS(
+                    proxy=self.proxy,
+                    verify=self.verify,
+                    impersonate="adaptive",
+                    impersonate_os="adaptive",
+                    scheduler=self.scheduler,
+                    priority=priority,
+                )
+            return self.engines[priority]
+
+    def stats(self) -> dict[str, Any]:
+        """Get the scheduler stats and the ratelimit stats of the impersonation profiles."""
+        return {"scheduler": self.scheduler.stats(), "profiles": self.ddgs.profile_stats.stats()}
+
+    def search(
+        self, method: str, kwargs: dict[str, Any], priority: str = "interactive", tenant: str = "default"
+    ) -> list[dict[str, str]]:
+        """Get results from cache, from an identical in-flight search, or run a new search."""
+        key = (method, tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in kwargs.items())))
+        results = self.cache.get(key)
+        if results is None:
+            results, _ = self.single_flight.do(key, lambda: self._search(key, method, kwargs, priority, tenant))
+        return results
+
+    def _search(
+        self, key: tuple[Any, ...], method: str, kwargs: dict[str, Any], priority: str, tenant: str
+    ) -> list[dict[str, str]]:
+        slots = self._slots[priority]
+        if not slots.acquire(blocking=False):
+            with self._waiting_lock:
+                if self._waiting >= self.max_queue:
+                    raise GatewayBusyException("Too many queued requests")
+                self._waiting += 1
+            try:
+                acquired = slots.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._waiting_lock:
+                    self._waiting -= 1
+            if not acquired:
+                raise GatewayBusyException(f"No free slot in {self.queue_timeout} seconds")
+
+        engine = self.get_engine(priority)
+        try:
+            with engine.as_tenant(tenant):
+                results: list[dict[str, str]] = getattr(engine, method)(**kwargs)
+        finally:
+            slots.release()
+        if self.cache_ttl and not getattr(results, "partial", False):
+            self.cache.set(key, results)  # partial results are not cached, the next request searches again
+        return results
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable
+from time import time
+from types import TracebackType
+from typing import Any
+
+from .utils import json_dumps, json_loads
+
+logger = logging.getLogger("duckduckgo_search.index")
+
+URL_KEYS = {"text": "href", "news": "url"}  # indexed verticals and the result field with their url
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    href TEXT NOT NULL UNIQUE,
+    vertical TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    date TEXT NOT NULL,
+    data TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS results_fts USING fts5(
+    title, body, href, date UNINDEXED, content='results', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS results_ai AFTER INSERT ON results BEGIN
+    INSERT INTO results_fts (rowid, title, body, href, date) VALUES (new.id, new.title, new.body, new.href, new.date);
+END;
+CREATE TRIGGER IF NOT EXISTS results_ad AFTER DELETE ON results BEGIN
+    INSERT INTO results_fts (results_fts, rowid, title, body, href, date)
+    VALUES ('delete', old.id, old.title, old.body, old.href, old.date);
+END;
+CREATE TRIGGER IF NOT EXISTS results_au AFTER UPDATE ON results BEGIN
+    INSERT INTO results_fts (results_fts, rowid, title, body, href, date)
+    VALUES ('delete', old.id, old.title, old.body, old.href, old.date);
+    INSERT INTO results_fts (rowid, title, body, href, date) VALUES (new.id, new.title, new.body, new.href, new.date);
+END;
+"""
+UPSERT = """
+INSERT INTO results (href, vertical, keywords, title, body, date, data, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (href) DO UPDATE SET
+    keywords = excluded.keywords, title = excluded.title, body = excluded.body, date = excluded.date,
+    data = excluded.data, indexed_at = excluded.indexed_at
+WHERE (title, body, date) != (excluded.title, excluded.body, excluded.date)
+"""
+
+
+def _fts_query(keywords: str) -> str:
+    """Convert keywords to an FTS5 query matching all their words, FTS5 syntax characters are ignored."""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", keywords))
+
+
+class ResultIndex:
+    """Local full-text index of text() and news() results in SQLite FTS5, to re-query them offline.
+
+    Results are deduplicated by url: a result seen again replaces the indexed one only if its title, body
+    or date changed. add() buffers the results and writes them in batches of `batch_size` in one transaction,
+    search() and close() write the pending ones first.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] = ":memory:", batch_size: int = 500) -> None:
+        """Open or create the index.
+
+        Args:
+            path: path of the SQLite database. Defaults to ":memory:".
+            batch_size: number of buffered results that triggers a write. Defaults to 500.
+        """
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._pending: list[tuple[Any, ...]] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> ResultIndex:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_val: BaseException | None = None,
+        exc_tb: TracebackType | None = None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._lock:
+            count: int = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return count
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def add(self, results: Iterable[dict[str, str]], vertical: str = "text", keywords: str = "") -> None:
+        """Add search results to the index.
+
+        Args:
+            results: results of text() or news().
+            vertical: text, news. Defaults to "text".
+            keywords: keywords of the search. Defaults to "".
+        """
+        url_key = URL_KEYS[vertical]
+        now = time()
+        rows = [
+            (
+                r[url_key],
+                vertical,
+                keywords,
+                r.get("title", ""),
+                r.get("body", ""),
+                r.get("date", ""),
+                json_dumps(r, indent=False),
+                now,
+            )
+            for r in results
+            if r.get(url_key)
+        ]
+        with self._lock:
+            self._pending.extend(rows)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def flush(self) -> None:
+        """Write the buffered results."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffered results in one transaction. Call with the lock held."""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(UPSERT, self._pending)
+        logger.debug(f"Indexed {len(self._pending)} results")
+        self._pending.clear()
+
+    def search(
+        self, keywords: str, vertical: str | None = None, max_results: int | None = None
+    ) -> list[dict[str, str]]:
+        """Search the indexed results, best matches first.
+
+        Args:
+            keywords: words that must all appear in the title, body or url of the results.
+            vertical: text, news, or None for both. Defaults to None.
+            max_results: max number of results. Defaults to None (all matches).
+
+        Returns:
+            List of dictionaries with the results, as returned by text() or news().
+        """
+        query = _fts_query(keywords)
+        if not query:
+            return []
+        sql = "SELECT r.data FROM results_fts JOIN results r ON r.id = results_fts.rowid WHERE results_fts MATCH ?"
+        params: list[Any] = [query]
+        if vertical is not None:
+            sql += " AND r.vertical = ?"
+            params.append(vertical)
+        sql += " ORDER BY results_fts.rank LIMIT ?"
+        params.append(-1 if max_results is None else max_results)
+        with self._lock:
+            self._flush()
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json_loads(data) for (data,) in rows]
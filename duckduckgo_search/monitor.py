@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from types import TracebackType
+from typing import Any
+
+from .duckduckgo_search import DDGS
+from .exceptions import DuckDuckGoSearchException
+from .utils import json_dumps, json_loads
+
+logger = logging.getLogger("duckduckgo_search.monitor")
+
+TIMELIMITS = ((timedelta(days=1), "d"), (timedelta(days=7), "w"), (timedelta(days=30), "m"))
+
+
+class NewsMonitor:
+    """Poll DDGS.news() for many topics and return only the articles that are new since the last poll.
+
+    Each topic keeps a high-water mark: the date of its latest article and the urls of the articles seen within
+    `retention` of it. A poll asks only for the smallest timelimit covering the time since the latest article,
+    skips seen and older articles, and stops paginating after `stop_after` already known articles in a row.
+    The state is saved to `state_path` by save(), poll_many() and when leaving the context manager.
+    """
+
+    def __init__(
+        self,
+        state_path: str | os.PathLike[str] | None = None,
+        ddgs: DDGS | None = None,
+        retention: timedelta = timedelta(days=7),
+        stop_after: int = 5,
+    ) -> None:
+        """Initialize the monitor and load its state.
+
+        Args:
+            state_path: path of the json state file. If None, the state is kept in memory only. Defaults to None.
+            ddgs: DDGS instance used for the searches. Defaults to None (a new instance).
+            retention: how long before the latest article the seen urls are kept, older articles
+                are never reported. Defaults to 7 days.
+            stop_after: number of known articles in a row that stops the pagination of a topic. Defaults to 5.
+        """
+        self.state_path = state_path
+        self.ddgs = ddgs or DDGS()
+        self.retention = retention
+        self.stop_after = stop_after
+        self._lock = threading.Lock()
+        self._topics: dict[str, dict[str, Any]] = {}
+        if state_path and os.path.exists(state_path):
+            try:
+                with open(state_path, "rb") as file:
+                    self._topics = json_loads(file.read())
+            except (OSError, DuckDuckGoSearchException) as ex:
+                logger.warning(f"NewsMonitor() {state_path=} {type(ex).__name__}: {ex}, starting with an empty state")
+
+    def __enter__(self) -> NewsMonitor:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_val: BaseException | None = None,
+        exc_tb: TracebackType | None = None,
+    ) -> None:
+        self.save()
+
+    def save(self) -> None:
+        """Write the state to state_path."""
+        if not self.state_path:
+            return
+        with self._lock:
+            data = json_dumps(self._topics)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.state_path)), suffix=".tmp")
+        try:
+            with open(fd, "w", encoding="utf-8") as file:
+                file.write(data)
+            os.replace(tmp_path, self.state_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def poll(
+        self,
+        keywords: str,
+        region: str = "us-en",
+        safesearch: str = "moderate",
+        max_results: int | None = 100,
+    ) -> list[dict[str, str]]:
+        """Get the news articles about keywords published since the last poll.
+
+        Args:
+            keywords: keywords for query.
+            region: us-en, uk-en, ru-ru, etc. Defaults to "us-en".
+            safesearch: on, moderate, off. Defaults to "moderate".
+            max_results: max number of articles to read. Defaults to 100.
+
+        Returns:
+            List of dictionaries with the new articles, like news() results. The first poll of a topic
+            returns all articles.
+
+        Raises:
+            DuckDuckGoSearchException: Base exception for duckduckgo_search errors.
+            RatelimitException: Inherits from DuckDuckGoSearchException, raised for exceeding API request rate limits.
+            TimeoutException: Inherits from DuckDuckGoSearchException, raised for API request timeouts.
+        """
+        key = f"{region}:{keywords}"
+        with self._lock:
+            topic = self._topics.get(key, {})
+            latest: str | None = topic.get("latest")
+            seen: dict[str, str] = dict(topic.get("seen", {}))
+
+        timelimit, cutoff = None, ""
+        if latest:
+            latest_date = datetime.fromisoformat(latest)
+            age = datetime.now(timezone.utc) - latest_date
+            timelimit = next((limit for period, limit in TIMELIMITS if age < period), None)
+            cutoff = (latest_date - self.retention).isoformat()
+
+        new: list[dict[str, str]] = []
+        known = 0
+        for article in self.ddgs._news(keywords, region, safesearch, timelimit, max_results):
+            if article["url"] in seen or article["date"] < cutoff:
+                known += 1
+                if known >= self.stop_after:
+                    break  # closes the generator, no more pages are requested
+                continue
+            known = 0
+            new.append(article)
+        logger.debug(f"poll() {key=} {timelimit=} {len(new)} new articles")
+
+        for article in new:
+            seen[article["url"]] = article["date"]
+        if seen:
+            latest = max(seen.values())
+            cutoff = (datetime.fromisoformat(latest) - self.retention).isoformat()
+            seen = {url: date for url, date in seen.items() if date >= cutoff}
+        with self._lock:
+            self._topics[key] = {"latest": latest, "seen": seen}
+        return new
+
+    def poll_many(
+        self, topics: Iterable[str], **kwargs: Any
+    ) -> Iterator[tuple[str, list[dict[str, str]], Exception | None]]:
+        """Poll many topics one after another, then save the state.
+
+        Args:
+            topics: keywords of the topics.
+            kwargs: keyword arguments of poll(): region, safesearch, max_results.
+
+        Yields:
+            Tuples (keywords, new articles, exception or None).
+        """
+        try:
+            for keywords in topics:
+                try:
+                    yield keywords, self.poll(keywords, **kwargs), None
+                except DuckDuckGoSearchException as ex:
+                    logger.info(f"poll_many() {keywords=} {type(ex).__name__}: {ex}")
+                    yield keywords, [], ex
+        finally:
+            self.save()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Sequence
+from random import choice, random
+from typing import Any
+
+logger = logging.getLogger("duckduckgo_search.profiles")
+
+
+class ProfileStats:
+    """Ratelimit and success counts of the impersonation profiles, for adaptive profile selection.
+
+    Browser profiles (e.g. "chrome_146") and OS profiles (e.g. "windows") are counted separately, so each of
+    them learns from all the requests it took part in. choose() is epsilon-greedy: with probability `explore`
+    it picks a random profile, otherwise the profile with the lowest estimated ratelimit rate. The estimate
+    starts from a prior of one ratelimited and one successful request, so unused profiles get tried.
+    """
+
+    def __init__(self, explore: float = 0.1) -> None:
+        """Initialize the stats.
+
+        Args:
+            explore: probability of choosing a random profile instead of the best one. Defaults to 0.1.
+        """
+        self.explore = explore
+        self._counts: dict[str, list[int]] = {}  # profile -> [requests, ratelimits]
+        self._lock = threading.Lock()
+
+    def record(self, profile: str, ratelimited: bool) -> None:
+        """Record the outcome of a request made with the profile."""
+        with self._lock:
+            counts = self._counts.setdefault(profile, [0, 0])
+            counts[0] += 1
+            counts[1] += ratelimited
+
+    def _ratelimit_rate(self, profile: str) -> float:
+        """Estimated ratelimit rate of the profile. Call with the lock held."""
+        requests, ratelimits = self._counts.get(profile, (0, 0))
+        return (ratelimits + 1) / (requests + 2)
+
+    def choose(self, profiles: Sequence[str]) -> str:
+        """Choose one of the profiles, ties are broken at random."""
+        if random() < self.explore:
+            return choice(profiles)
+        with self._lock:
+            rates = {profile: self._ratelimit_rate(profile) for profile in profiles}
+        best = min(rates.values())
+        return choice([profile for profile, rate in rates.items() if rate == best])
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Get per-profile stats: requests, ratelimits and the estimated ratelimit rate."""
+        with self._lock:
+            return {
+                profile: {
+                    "requests": requests,
+                    "ratelimits": ratelimits,
+                    "ratelimit_rate": self._ratelimit_rate(profile),
+                }
+                for profile, (requests, ratelimits) in sorted(self._counts.items())
+            }
+
+
+PROFILE_STATS = ProfileStats()  # shared by the DDGS instances of the process
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from time import time
+from typing import Any
+
+logger = logging.getLogger("duckduckgo_search.scheduler")
+
+PRIORITY_SHARES = {"interactive": 4.0, "bulk": 1.0}
+PRIORITY_CONCURRENCY = {"interactive": 4, "bulk": 2}
+
+
+class _Waiter:
+    __slots__ = ("tenant", "tag", "enqueued_at")
+
+    def __init__(self, tenant: str, tag: float) -> None:
+        self.tenant = tenant
+        self.tag = tag
+        self.enqueued_at = time()
+
+
+class _PriorityClass:
+    """Queued requests of one priority class: start-time fair queuing across its tenants."""
+
+    def __init__(self, share: float, concurrency: int) -> None:
+        self.share = share
+        self.concurrency = concurrency
+        self.active = 0
+        self.tags: deque[float] = deque()  # class-level start tags of the queued requests, ascending
+        self.finish = 0.0  # class-level finish tag of the last queued request
+        self.vtime = 0.0  # tenant-level virtual time
+        self.tenants: dict[str, deque[_Waiter]] = {}
+        self.tenant_finish: dict[str, float] = {}
+        self.dispatched = 0
+        self.wait_time = 0.0
+
+    def push(self, tenant: str, weight: float, vtime: float) -> _Waiter:
+        tag = max(vtime, self.finish)
+        self.finish = tag + 1 / self.share
+        self.tags.append(tag)
+        tenant_tag = max(self.vtime, self.tenant_finish.get(tenant, 0.0))
+        self.tenant_finish[tenant] = tenant_tag + 1 / weight
+        waiter = _Waiter(tenant, tenant_tag)
+        self.tenants.setdefault(tenant, deque()).append(waiter)
+        return waiter
+
+    def head(self) -> _Waiter | None:
+        """Get the next request of the class: the smallest start tag over the tenants' queue heads."""
+        heads = [queue[0] for queue in self.tenants.values() if queue]
+        return min(heads, key=lambda w: w.tag) if heads else None
+
+    def pop(self, waiter: _Waiter) -> float:
+        """Remove waiter from its tenant queue, return the class-level tag it consumed."""
+        queue = self.tenants[waiter.tenant]
+        queue.remove(waiter)
+        if not queue:
+            del self.tenants[waiter.tenant]
+            del self.tenant_finish[waiter.tenant]
+        return self.tags.popleft()
+
+
+class RequestScheduler:
+    """Dispatch the requests of many DDGS instances through one paced request slot.
+
+    Requests start at most once per `interval` seconds. When several requests wait for the next slot, it goes
+    to a priority class by weighted fair queuing over the class shares (with the default shares, interactive
+    requests get 4 of every 5 slots while bulk requests are waiting too, and all of them otherwise), and
+    within the class to a tenant by weighted fair queuing over the tenant weights. Each class also has its
+    own limit of concurrent requests, so a bulk crawl can never occupy all connections.
+
+    Requests are only granted when their slot comes: a burst of bulk requests does not reserve slots in
+    advance, so an interactive request waits at most about one interval.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.75,
+        shares: dict[str, float] | None = None,
+        concurrency: dict[str, int] | None = None,
+        tenant_weights: dict[str, float] | None = None,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            interval: min seconds between the starts of two requests. Defaults to 0.75.
+            shares: slot share of each priority class. Defaults to {"interactive": 4, "bulk": 1}.
+            concurrency: max concurrent requests of each priority class. Defaults to {"interactive": 4, "bulk": 2}.
+            tenant_weights: slot weight of each tenant within its class, unknown tenants have weight 1.
+                Defaults to None.
+        """
+        shares = shares or PRIORITY_SHARES
+        concurrency = concurrency or PRIORITY_CONCURRENCY
+        assert shares.keys() == concurrency.keys(), "shares and concurrency must define the same classes"
+        self.interval = interval
+        self.tenant_weights = tenant_weights or {}
+        self._classes = {name: _PriorityClass(shares[name], concurrency[name]) for name in shares}
+        self._vtime = 0.0
+        self._next_slot = 0.0
+        self._cond = threading.Condition()
+
+    def _pick(self) -> tuple[_PriorityClass, _Waiter] | None:
+        """Get the request to dispatch next: the class with the smallest start tag that has a free connection."""
+        candidates = [pc for pc in self._classes.values() if pc.tags and pc.active < pc.concurrency]
+        if not candidates:
+            return None
+        pclass = min(candidates, key=lambda pc: pc.tags[0])
+        waiter = pclass.head()
+        return (pclass, waiter) if waiter else None
+
+    def acquire(self, priority: str = "interactive", tenant: str = "default", deadline: float | None = None) -> bool:
+        """Wait for a request slot. Release it with release(priority) when the request is done.
+
+        Args:
+            priority: priority class of the request. Defaults to "interactive".
+            tenant: tenant of the request, for fair queuing within the class. Defaults to "default".
+            deadline: give up waiting at this time.time(). Defaults to None.
+
+        Returns:
+            True when the slot is granted, False if the deadline is reached first.
+        """
+        pclass = self._classes[priority]
+        with self._cond:
+            waiter = pclass.push(tenant, self.tenant_weights.get(tenant, 1.0), self._vtime)
+            while True:
+                now = time()
+                picked = self._pick()
+                if picked and picked[1] is waiter and now >= self._next_slot:
+                    self._vtime = max(self._vtime, pclass.pop(waiter))
+                    pclass.vtime = max(pclass.vtime, waiter.tag)
+                    self._next_slot = now + self.interval
+                    pclass.active += 1
+                    pclass.dispatched += 1
+                    pclass.wait_time += now - waiter.enqueued_at
+                    self._cond.notify_all()
+                    return True
+                if deadline is not None and now >= deadline:
+                    pclass.pop(waiter)  # give back the queue position
+                    self._cond.notify_all()
+                    return False
+                timeout = max(self._next_slot - now, 0.0) if picked and picked[1] is waiter else None
+                if deadline is not None:
+                    timeout = min(timeout, deadline - now) if timeout is not None else deadline - now
+                self._cond.wait(timeout)
+
+    def release(self, priority: str = "interactive") -> None:
+        """Release the connection of a finished request of the priority class."""
+        with self._cond:
+            self._classes[priority].active -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Get per-class stats: queued and active requests, dispatched requests and their mean wait in seconds."""
+        with self._cond:
+            return {
+                name: {
+                    "queued": len(pc.tags),
+                    "active": pc.active,
+                    "dispatched": pc.dispatched,
+                    "mean_wait": pc.wait_time / pc.dispatched if pc.dispatched else 0.0,
+                }
+                for name, pc in self._classes.items()
+            }
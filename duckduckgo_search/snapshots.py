@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from collections.abc import Iterable, Iterator
+from hashlib import blake2b
+from time import time
+from types import TracebackType
+from typing import Any
+
+logger = logging.getLogger("duckduckgo_search.snapshots")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS resultsets (id INTEGER PRIMARY KEY, fingerprint BLOB NOT NULL UNIQUE, items BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS snapshots (
+    query TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    resultset_id INTEGER NOT NULL REFERENCES resultsets(id),
+    PRIMARY KEY (query, taken_at)
+) WITHOUT ROWID;
+"""
+SQLITE_MAX_VARIABLES = 900
+
+
+def _hash(text: str) -> int:
+    """Signed 64-bit hash of text."""
+    return int.from_bytes(blake2b(text.encode(), digest_size=8).digest(), "little", signed=True)
+
+
+def _diff(old: array[int], new: array[int]) -> dict[str, list[Any]]:
+    """Diff two result sets encoded as flat arrays of (url id, title hash, body hash) triples."""
+    old_ranks = {old[i]: (i // 3, old[i + 1], old[i + 2]) for i in range(0, len(old), 3)}
+    new_ranks = {new[i]: (i // 3, new[i + 1], new[i + 2]) for i in range(0, len(new), 3)}
+    diff: dict[str, list[Any]] = {"new": [], "dropped": [], "moved": [], "changed": []}
+    for url_id, (rank, title, body) in new_ranks.items():
+        if url_id not in old_ranks:
+            diff["new"].append((url_id, rank + 1))
+            continue
+        old_rank, old_title, old_body = old_ranks[url_id]
+        if old_rank != rank:
+            diff["moved"].append((url_id, old_rank + 1, rank + 1))
+        if (old_title, old_body) != (title, body):
+            diff["changed"].append(url_id)
+    diff["dropped"] = [(url_id, rank + 1) for url_id, (rank, _, _) in old_ranks.items() if url_id not in new_ranks]
+    return diff
+
+
+class SnapshotStore:
+    """Store of search result snapshots in SQLite, with a diff API for SERP tracking.
+
+    Urls are stored once and encoded as integers. A result set is a fingerprinted blob of (url id, title hash,
+    body hash) triples stored once: a snapshot of unchanged results only adds a (query, time, result set id) row.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] = ":memory:") -> None:
+        """Open or create the store.
+
+        Args:
+            path: path of the SQLite database. Defaults to ":memory:".
+        """
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> SnapshotStore:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None = None,
+        exc_val: BaseException | None = None,
+        exc_tb: TracebackType | None = None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def add(
+        self, query: str, results: Iterable[dict[str, str]], taken_at: float | None = None, url_key: str = "href"
+    ) -> bool:
+        """Add a snapshot of the results of a query.
+
+        Args:
+            query: query key, e.g. the keywords, or "region:keywords" to track regions separately.
+            results: results of text(), news(), ... in rank order.
+            taken_at: time of the snapshot. Defaults to None (now).
+            url_key: result field with the url, "href" for text() and "url" for the other searches.
+                Defaults to "href".
+
+        Returns:
+            True if the results changed since the previous snapshot of the query.
+        """
+        with self._lock, self._conn:
+            return self._add(query, list(results), taken_at, url_key)
+
+    def add_many(
+        self,
+        snapshots: Iterable[tuple[str, Iterable[dict[str, str]]]],
+        taken_at: float | None = None,
+        url_key: str = "href",
+    ) -> list[str]:
+        """Add the snapshots of many queries in one transaction.
+
+        The snapshots are collected before the transaction starts, so the searches of a generator like
+        `((q, ddgs.text(q)) for q in queries)` do not keep the database locked.
+
+        Args:
+            snapshots: (query, results) pairs.
+            taken_at: time of the snapshots. Defaults to None (now).
+            url_key: result field with the url. Defaults to "href".
+
+        Returns:
+            Queries whose results changed since their previous snapshot.
+        """
+        taken_at = time() if taken_at is None else taken_at
+        collected = [(query, list(results)) for query, results in snapshots]
+        with self._lock, self._conn:
+            return [query for query, results in collected if self._add(query, results, taken_at, url_key)]
+
+    def _add(self, query: str, results: list[dict[str, str]], taken_at: float | None, url_key: str) -> bool:
+        """Add a snapshot. Call with the lock held, in a transaction."""
+        urls = [r[url_key] for r in results]
+        hashes = [(_hash(r.get("title", "")), _hash(r.get("body", ""))) for r in results]
+        fingerprint = blake2b(repr((urls, hashes)).encode(), digest_size=16).digest()
+        row = self._conn.execute("SELECT id FROM resultsets WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if row:
+            resultset_id = row[0]  # seen before: no url lookups, no new result set
+        else:
+            self._conn.executemany("INSERT OR IGNORE INTO urls (url) VALUES (?)", ((url,) for url in urls))
+            url_ids = dict(self._select_in("SELECT url, id FROM urls WHERE url IN ({})", urls))
+            items = array("q")
+            for url, (title, body) in zip(urls, hashes):
+                items.extend((url_ids[url], title, body))
+            resultset_id = self._conn.execute(
+                "INSERT INTO resultsets (fingerprint, items) VALUES (?, ?)", (fingerprint, items.tobytes())
+            ).lastrowid
+        previous = self._conn.execute(
+            "SELECT resultset_id FROM snapshots WHERE query = ? ORDER BY taken_at DESC LIMIT 1", (query,)
+        ).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO snapshots (query, taken_at, resultset_id) VALUES (?, ?, ?)",
+            (query, time() if taken_at is None else taken_at, resultset_id),
+        )
+        return previous is None or previous[0] != resultset_id
+
+    def _select_in(self, sql: str, values: list[Any]) -> Iterator[tuple[Any, ...]]:
+        """Run a SELECT with a `{}` IN list placeholder in batches of SQLITE_MAX_VARIABLES values."""
+        for i in range(0, len(values), SQLITE_MAX_VARIABLES):
+            batch = values[i : i + SQLITE_MAX_VARIABLES]
+            yield from self._conn.execute(sql.format(",".join("?" * len(batch))), batch)
+
+    def history(self, query: str) -> list[tuple[float, int]]:
+        """Get the (taken_at, result set id) snapshots of a query, oldest first."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT taken_at, resultset_id FROM snapshots WHERE query = ? ORDER BY taken_at", (query,)
+            ).fetchall()
+
+    def diff(self, query: str, old: float | None = None, new: float | None = None) -> dict[str, list[Any]]:
+        """Diff two snapshots of a query.
+
+        Args:
+            query: query key.
+            old: taken_at of the old snapshot. Defaults to None (the one before the new snapshot).
+            new: taken_at of the new snapshot. Defaults to None (the latest).
+
+        Returns:
+            Dictionary with "new" [(url, rank)], "dropped" [(url, old rank)], "moved" [(url, old rank, new rank)]
+            and "changed" [url] (same url, different title or body). Ranks start at 1.
+        """
+        history = dict(self.history(query))
+        times = sorted(history)
+        new = times[-1] if new is None and times else new
+        if new is None or new not in history:
+            raise KeyError(f"No snapshot of {query=} at {new}")
+        if old is None:
+            older = [t for t in times if t < new]
+            old = older[-1] if older else None
+        if old is not None and old not in history:
+            raise KeyError(f"No snapshot of {query=} at {old}")
+        old_id = history[old] if old is not None else None
+        return next(self._diff_resultsets([(query, old_id, history[new])]))[1]
+
+    def diff_all(self, changed_only: bool = True) -> Iterator[tuple[str, dict[str, list[Any]]]]:
+        """Diff the latest snapshot of every query with the previous one.
+
+        Args:
+            changed_only: skip the queries whose latest results are unchanged. Defaults to True.
+
+        Yields:
+            Tuples (query, diff) like diff(), queries with a single snapshot are diffed against no results.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT query, prev_id, resultset_id FROM (
+                    SELECT query, resultset_id, taken_at,
+                        LAG(resultset_id) OVER (PARTITION BY query ORDER BY taken_at) AS prev_id,
+                        ROW_NUMBER() OVER (PARTITION BY query ORDER BY taken_at DESC) AS n
+                    FROM snapshots
+                ) WHERE n = 1
+                """
+            ).fetchall()
+        pending = []
+        for query, prev_id, resultset_id in rows:
+            if prev_id == resultset_id:
+                if not changed_only:
+                    yield query, {"new": [], "dropped": [], "moved": [], "changed": []}
+            else:
+                pending.append((query, prev_id, resultset_id))
+        for i in range(0, len(pending), SQLITE_MAX_VARIABLES // 2):
+            yield from self._diff_resultsets(pending[i : i + SQLITE_MAX_VARIABLES // 2])
+
+    def _diff_resultsets(self, pairs: list[tuple[str, int | None, int]]) -> Iterator[tuple[str, dict[str, list[Any]]]]:
+        """Diff (query, old result set id, new result set id) triples, decoding url ids in one batch."""
+        with self._lock:
+            ids = list({i for _, old, new in pairs for i in (old, new) if i is not None})
+            blobs = dict(self._select_in("SELECT id, items FROM resultsets WHERE id IN ({})", ids))
+            diffs = []
+            for query, old, new in pairs:
+                old_items, new_items = array("q"), array("q")
+                if old is not None:
+                    old_items.frombytes(blobs[old])
+                new_items.frombytes(blobs[new])
+                diffs.append((query, _diff(old_items, new_items)))
+            url_ids = {item[0] for _, d in diffs for k in ("new", "dropped", "moved") for item in d[k]}
+            url_ids.update(url_id for _, d in diffs for url_id in d["changed"])
+            urls = dict(self._select_in("SELECT id, url FROM urls WHERE id IN ({})", list(url_ids)))
+        for query, d in diffs:
+            yield (
+                query,
+                {
+                    "new": [(urls[url_id], rank) for url_id, rank in d["new"]],
+                    "dropped": [(urls[url_id], rank) for url_id, rank in d["dropped"]],
+                    "moved": [(urls[url_id], old_rank, rank) for url_id, old_rank, rank in d["moved"]],
+                    "changed": [urls[url_id] for url_id in d["changed"]],
+                },
+            )
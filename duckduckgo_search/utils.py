@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 import re
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
 from html import unescape
-from typing import Any
+from random import random
+from time import monotonic
+from typing import Any, Callable, Generic, TypeVar
 from urllib.parse import unquote
 
 from .exceptions import DuckDuckGoSearchException
@@ -15,14 +20,15 @@ except ImportError:
     import json
 
 REGEX_STRIP_TAGS = re.compile("<.*?>")
+T = TypeVar("T")
 
 
-def json_dumps(obj: Any) -> str:
+def json_dumps(obj: Any, indent: bool = True) -> str:
     try:
         return (
-            orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+            orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode()
             if HAS_ORJSON
-            else json.dumps(obj, ensure_ascii=False, indent=2)
+            else json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
         )
     except Exception as ex:
         raise DuckDuckGoSearchException(f"{type(ex).__name__}: {ex}") from ex
@@ -35,7 +41,7 @@ def json_loads(obj: str | bytes) -> Any:
         raise DuckDuckGoSearchException(f"{type(ex).__name__}: {ex}") from ex
 
 
-def _extract_vqd(html_bytes: bytes, keywords: str) -> str:
+def _extract_vqd(html_bytes: bytes | bytearray, keywords: str) -> str:
     """Extract vqd from html bytes."""
     for c1, c1_len, c2 in (
         (b'vqd="', 5, b'"'),
@@ -51,6 +57,28 @@ def _extract_vqd(html_bytes: bytes, keywords: str) -> str:
     raise DuckDuckGoSearchException(f"_extract_vqd() {keywords=} Could not extract vqd.")
 
 
+def _stream_vqd(chunks: Iterable[bytes], keywords: str) -> tuple[str, int]:
+    """Extract vqd from streamed html chunks, stop reading as soon as the token is complete.
+
+    Returns:
+        Tuple (vqd, number of bytes read).
+    """
+    buffer = bytearray()
+    found = False
+    for chunk in chunks:
+        searched = len(buffer)
+        buffer += chunk
+        found = found or buffer.find(b"vqd=", max(0, searched - 3)) != -1
+        if found:
+            try:
+                vqd = _extract_vqd(buffer, keywords)
+            except DuckDuckGoSearchException:
+                continue
+            if not vqd.startswith(('"', "'")):  # not the unquoted pattern matching a truncated quoted value
+                return vqd, len(buffer)
+    return _extract_vqd(buffer, keywords), len(buffer)
+
+
 def _normalize(raw_html: str) -> str:
     """Strip HTML tags from the raw_html string."""
     return unescape(REGEX_STRIP_TAGS.sub("", raw_html)) if raw_html else ""
@@ -64,3 +92,141 @@ def _normalize_url(url: str) -> str:
 def _expand_proxy_tb_alias(proxy: str | None) -> str | None:
     """Expand "tb" to a full proxy URL if applicable."""
     return "socks5://127.0.0.1:9150" if proxy == "tb" else proxy
+
+
+class _TTLCache(Generic[T]):
+    """Thread-safe LRU cache with per-entry time to live."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> T | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: T, ttl: float | None = None) -> None:
+        with self._lock:
+            self._data[key] = (monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def items(self) -> list[tuple[Hashable, T, float]]:
+        """Get the live entries as (key, value, remaining ttl) tuples."""
+        now = monotonic()
+        with self._lock:
+            return [(k, v, expires - now) for k, (expires, v) in self._data.items() if expires > now]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class _PagePredictor:
+    """Learn, per vertical, whether the page after a short page is empty, to skip requesting it.
+
+    A page is short if it has fewer new results than `short_ratio` times the largest page seen. Once `min_samples`
+    pages following short pages were fetched and at least `threshold` of them were empty, the pages following
+    short pages are skipped, except for an `explore` fraction of them that keeps the estimate up to date.
+    """
+
+    def __init__(
+        self, short_ratio: float = 0.5, threshold: float = 0.9, min_samples: int = 5, explore: float = 0.1
+    ) -> None:
+        self.short_ratio = short_ratio
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.explore = explore
+        self.skipped = 0
+        self._page_size: dict[str, int] = {}
+        self._after_short: dict[str, list[int]] = {}  # vertical: [empty next pages, fetched next pages]
+        self._lock = threading.Lock()
+
+    def _is_short(self, vertical: str, count: int) -> bool:
+        return count < self.short_ratio * self._page_size.get(vertical, 0)
+
+    def observe(self, vertical: str, count: int, prev_count: int | None = None) -> None:
+        """Record a page with `count` new results, following a page with `prev_count` results."""
+        with self._lock:
+            if prev_count is not None and self._is_short(vertical, prev_count):
+                outcome = self._after_short.setdefault(vertical, [0, 0])
+                outcome[0] += count == 0
+                outcome[1] += 1
+            self._page_size[vertical] = max(self._page_size.get(vertical, 0), count)
+
+    def skip_next(self, vertical: str, count: int) -> bool:
+        """Predict whether the page following a page with `count` new results is empty."""
+        with self._lock:
+            empty, fetched = self._after_short.get(vertical, (0, 0))
+            skip = (
+                self._is_short(vertical, count)
+                and fetched >= self.min_samples
+                and empty >= self.threshold * fetched
+                and random() >= self.explore
+            )
+            self.skipped += skip
+            return skip
+
+
+class _Call(Generic[T]):
+    """In-flight call of _SingleFlight."""
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: T | None = None
+        self.exception: BaseException | None = None
+
+
+class _SingleFlight(Generic[T]):
+    """Run a function once for concurrent callers with the same key, all of them get its result or exception."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call[T]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], T], timeout: float | None = None) -> tuple[T, bool]:
+        """Call func() or wait for the in-flight call with the same key.
+
+        Args:
+            key: key of the call.
+            func: function to call.
+            timeout: max seconds to wait for an in-flight call, None to wait until it is done. Defaults to None.
+
+        Returns:
+            Tuple (result, shared), shared is True if the result came from another caller's call.
+
+        Raises:
+            TimeoutError: the in-flight call did not finish in `timeout` seconds.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+        if not leader:
+            if not call.event.wait(timeout):
+                raise TimeoutError(f"in-flight call {key} did not finish in {timeout} seconds")
+            if call.exception is not None:
+                raise call.exception
+            return call.result, True  # type: ignore[return-value]
+
+        try:
+            call.result = func()
+            return call.result, False
+        except BaseException as ex:
+            call.exception = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
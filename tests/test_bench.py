@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from duckduckgo_search.bench import StandInServer, _parse_mix, run_bench
+
+
+def test_run_bench() -> None:
+    with StandInServer(latency=0.01, seed=1) as server:
+        report = run_bench(
+            server.url, "text:2,news:1,images:1,videos:1", concurrency=2, queries=10, interval=0.01, seed=1
+        )
+    assert report["queries"] == report["ok"] == 10
+    assert report["results"] > 0
+    assert report["p50"] <= report["p95"] <= report["p99"]
+    assert report["network"] > 0
+    assert server.requests >= 10
+
+
+@pytest.mark.parametrize("backend", ["html", "lite"])
+def test_run_bench_pages(backend: str) -> None:
+    with StandInServer(latency=0, results_per_page=10, pages=3) as server:
+        report = run_bench(server.url, "text", queries=1, interval=0.01, max_results=30, backend=backend)
+    assert report["ok"] == 1
+    assert report["results"] == 30
+    assert report["sleep"] > 0
+
+
+def test_run_bench_ratelimit() -> None:
+    with StandInServer(latency=0, ratelimit=1.0) as server:
+        report = run_bench(server.url, {"text": 1.0}, queries=3, rate=50, interval=0.01, backend="html")
+    assert report["ratelimited"] == 3
+    assert report["ok"] == 0
+    assert server.ratelimited == server.requests
+
+
+def test_fixtures(tmp_path: Path) -> None:
+    (tmp_path / "news.json").write_text(
+        '{"results": [{"date": 1700000000, "title": "fixture", "excerpt": "", "url": "https://a.b/", "source": ""}]}'
+    )
+    with StandInServer(latency=0, fixtures_dir=tmp_path) as server:
+        report = run_bench(server.url, "news", queries=1, interval=0.01)
+    assert report["ok"] == 1
+    assert report["results"] == 1
+
+
+def test_parse_mix() -> None:
+    assert _parse_mix("text:3, news") == {"text": 3.0, "news": 1.0}
+    with pytest.raises(ValueError):
+        _parse_mix("text,maps")
+
+
+def test_http2() -> None:
+    pytest.importorskip("h2")
+    with StandInServer(latency=0.01, http2=True) as server:
+        report = run_bench(
+            server.url, "text:1,news:1", concurrency=4, queries=8, interval=0, max_results=20, http2=True, seed=1
+        )
+    assert report["ok"] == 8
+    assert server.connections == {"h2": 1}  # the concurrent queries are multiplexed
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="needs openssl to create a certificate")
+def test_tls(tmp_path: Path) -> None:
+    cert, key = str(tmp_path / "cert.pem"), str(tmp_path / "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert]
+        + ["-days", "1", "-subj", "/CN=127.0.0.1"],
+        check=True,
+        capture_output=True,
+    )
+    with StandInServer(latency=0, certfile=cert, keyfile=key) as server:
+        assert server.url.startswith("https://")
+        report = run_bench(server.url, "text", queries=2, interval=0, backend="html", verify=False)
+    assert report["ok"] == 2
+    assert set(server.connections) == {"http/1.1"}
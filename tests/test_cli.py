@@ -1,21 +1,26 @@
 from __future__ import annotations
 
+import json
 import os
 import pathlib
 import shutil
 import time
 from pathlib import Path
+from typing import Any
 
 import pytest
 from click.testing import CliRunner
 
 from duckduckgo_search import DDGS, __version__
+from duckduckgo_search.bench import StandInServer
 from duckduckgo_search.cli import _download_results, _save_csv, _save_json, cli
+from duckduckgo_search.exceptions import RatelimitException
 
 runner = CliRunner()
 TEXT_RESULTS = []
 IMAGES_RESULTS = []
 
+
 @pytest.fixture(autouse=True)
 def pause_between_tests() -> None:
     time.sleep(2)
@@ -92,3 +97,57 @@ def test_images_download() -> None:
     for file in pathname.iterdir():
         assert file.is_file()
     shutil.rmtree(str(pathname))
+
+
+def test_local_command(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DDGS_INDEX", str(tmp_path / "index.db"))
+    monkeypatch.setattr(
+        DDGS, "news", lambda self, **kwargs: [{"title": "Rust 2.0", "body": "", "url": "https://example.com/rust"}]
+    )
+    runner.invoke(cli, ["news", "-k", "rust", "-o", str(tmp_path / "news.json")])
+    result = runner.invoke(cli, ["local", "-k", "rust", "-o", str(tmp_path / "local.json")])
+    assert result.exit_code == 0
+    assert json.loads((tmp_path / "local.json").read_text())[0]["title"] == "Rust 2.0"
+
+
+def test_bulk_keywords_file(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_news(self: DDGS, keywords: str, **kwargs: Any) -> list[dict[str, str]]:
+        if keywords == "bad":
+            raise RatelimitException("202 Ratelimit")
+        time.sleep(0.3)
+        return [{"title": keywords, "url": f"https://example.com/{keywords}"}]
+
+    monkeypatch.setattr(DDGS, "news", fake_news)
+    keywords = [f"topic {i}" for i in range(7)] + ["", "bad"]
+    start = time.time()
+    result = runner.invoke(cli, ["news", "-K", "-", "-w", "4", "-m", "10"], input="\n".join(keywords))
+    assert time.time() - start < 1.2
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sorted(line["keywords"] for line in lines) == sorted(k for k in keywords if k)
+    assert next(line for line in lines if line["keywords"] == "bad")["error"] == "RatelimitException: 202 Ratelimit"
+    assert "8 keywords, 7 results, 1 errors" in result.stderr and "RatelimitException: 1" in result.stderr
+    assert runner.invoke(cli, ["news"]).exit_code == 2
+    for options in (["-k", "python"], ["-o", "json"], ["-o", "results.csv"], ["-w", "0"], ["-w", "-1"]):
+        result = runner.invoke(cli, ["news", "-K", "-", *options], input="python")
+        assert result.exit_code == 2, options
+    assert runner.invoke(cli, ["images", "-K", "-", "-d"], input="cat").exit_code == 2
+
+
+def test_bench_command(tmp_path: Path) -> None:
+    output = tmp_path / "bench.json"
+    result = runner.invoke(
+        cli, ["bench", "-c", "1,2", "-n", "4", "-i", "0.01", "--latency", "0.01", "-o", str(output), "--seed", "1"]
+    )
+    assert result.exit_code == 0
+    assert "stand-in server" in result.output
+    reports = json.loads(output.read_text())
+    assert [r["concurrency"] for r in reports] == [1, 2]
+    assert all(r["ok"] == 4 for r in reports)
+
+
+def test_bench_command_url() -> None:
+    with StandInServer(latency=0.01) as server:
+        result = runner.invoke(cli, ["bench", "--url", server.url, "--h2", "-c", "1", "-n", "2", "-i", "0.01"])
+    assert result.exit_code == 0, result.output
+    assert "stand-in server" not in result.output
+    assert server.requests >= 2
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from duckduckgo_search import DDGS
+from duckduckgo_search.daemon import DDGSDaemon, daemon_request
+from duckduckgo_search.exceptions import RatelimitException
+
+
+@pytest.fixture()
+def daemon(tmp_path: Path) -> Iterator[DDGSDaemon]:
+    server = DDGSDaemon(str(tmp_path / "ddgs.sock"))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_daemon_request_without_daemon(tmp_path: Path) -> None:
+    assert daemon_request("text", {"keywords": "python"}, socket_path=str(tmp_path / "missing.sock")) is None
+
+
+def test_daemon_reuses_engine(daemon: DDGSDaemon, monkeypatch: pytest.MonkeyPatch) -> None:
+    engines = []
+
+    def fake_text(self: DDGS, keywords: str, **kwargs: str) -> list[dict[str, str]]:
+        engines.append(self)
+        return [{"title": keywords, "href": "https://example.com", "body": ""}]
+
+    monkeypatch.setattr(DDGS, "text", fake_text)
+    for _ in range(2):
+        results = daemon_request("text", {"keywords": "python"}, socket_path=daemon.socket_path)
+        assert results == [{"title": "python", "href": "https://example.com", "body": ""}]
+    assert len(engines) == 2 and engines[0] is engines[1]
+
+
+def test_daemon_runs_calls_concurrently(daemon: DDGSDaemon, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_text(self: DDGS, keywords: str, **kwargs: str) -> list[dict[str, str]]:
+        time.sleep(0.5)
+        return [{"title": keywords, "href": "https://example.com", "body": ""}]
+
+    monkeypatch.setattr(DDGS, "text", fake_text)
+    threads = [
+        threading.Thread(
+            target=daemon_request, args=("text", {"keywords": f"q{i}"}), kwargs={"socket_path": daemon.socket_path}
+        )
+        for i in range(4)
+    ]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.time() - start < 1.5
+
+
+def test_daemon_request_timeout(tmp_path: Path) -> None:
+    socket_path = str(tmp_path / "hung.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as hung:
+        hung.bind(socket_path)
+        hung.listen()  # accepts connections but never answers
+        start = time.time()
+        assert daemon_request("text", {"keywords": "python"}, socket_path=socket_path, timeout=0.2) is None
+        assert time.time() - start < 1
+
+
+def test_daemon_reraises_exceptions(daemon: DDGSDaemon, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_news(self: DDGS, keywords: str, **kwargs: str) -> list[dict[str, str]]:
+        raise RatelimitException("https://duckduckgo.com/news.js 202 Ratelimit")
+
+    monkeypatch.setattr(DDGS, "news", fake_news)
+    with pytest.raises(RatelimitException, match="202 Ratelimit"):
+        daemon_request("news", {"keywords": "python"}, socket_path=daemon.socket_path)
+
+
+def test_daemon_already_running(daemon: DDGSDaemon) -> None:
+    with pytest.raises(Exception, match="already running"):
+        DDGSDaemon(daemon.socket_path)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from duckduckgo_search.downloads import Downloader
+from duckduckgo_search.exceptions import DuckDuckGoSearchException
+
+FILES = {
+    "/a.bin": b"a" * 300_000,
+    "/b.bin": b"b" * 1000,
+    "/copy_of_b.bin": b"b" * 1000,
+    "/flaky.bin": b"f" * 300_000,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests: Counter[str] = Counter()
+    fail_first: set[str] = set()
+    if_range: list[str | None] = []
+
+    def do_GET(self) -> None:
+        self.requests[self.path] += 1
+        if self.headers.get("Range"):
+            self.if_range.append(self.headers.get("If-Range"))
+        if self.path in self.fail_first and self.requests[self.path] == 1:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/slow.bin":
+            self.send_response(200)
+            self.send_header("Content-Length", "4000")
+            self.end_headers()
+            for _ in range(4):
+                self.wfile.write(b"s" * 1000)
+                self.wfile.flush()
+                time.sleep(0.2)
+            return
+        if self.path not in FILES:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body, status = FILES[self.path], 200
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", '"v1"') == '"v1"':
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body, status = body[start:], 206
+        self.send_response(status)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.path == "/flaky.bin" and self.requests[self.path] == 1:
+            self.wfile.write(body[:100_000])  # connection drops halfway through the first response
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture()
+def base_url() -> Iterator[str]:
+    _Handler.requests = Counter()
+    _Handler.fail_first = set()
+    _Handler.if_range = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_and_skip(base_url: str, tmp_path: Path) -> None:
+    downloader = Downloader(chunk_size=4096)
+    assert downloader.download(f"{base_url}/a.bin", tmp_path / "a.bin") == "downloaded"
+    assert (tmp_path / "a.bin").read_bytes() == FILES["/a.bin"]
+    assert Downloader().download(f"{base_url}/a.bin", tmp_path / "a.bin") == "skipped"
+    assert _Handler.requests["/a.bin"] == 1
+
+
+def test_download_resume(base_url: str, tmp_path: Path) -> None:
+    (tmp_path / "a.bin.part").write_bytes(FILES["/a.bin"][:100_000])
+    assert Downloader().download(f"{base_url}/a.bin", tmp_path / "a.bin") == "resumed"
+    assert (tmp_path / "a.bin").read_bytes() == FILES["/a.bin"]
+    assert not (tmp_path / "a.bin.part").exists()
+
+
+def test_download_resume_complete_or_stale_part(base_url: str, tmp_path: Path) -> None:
+    (tmp_path / "a.bin.part").write_bytes(FILES["/a.bin"])
+    assert Downloader().download(f"{base_url}/a.bin", tmp_path / "a.bin") == "resumed"
+    assert (tmp_path / "a.bin").read_bytes() == FILES["/a.bin"]
+    (tmp_path / "b.bin.part").write_bytes(b"b" * 2000)
+    assert Downloader().download(f"{base_url}/b.bin", tmp_path / "b.bin") == "downloaded"
+    assert (tmp_path / "b.bin").read_bytes() == FILES["/b.bin"]
+    assert not (tmp_path / "a.bin.part").exists() and not (tmp_path / "b.bin.part").exists()
+
+
+def test_download_retry_resumes_with_etag(base_url: str, tmp_path: Path) -> None:
+    assert Downloader(backoff=0.01).download(f"{base_url}/flaky.bin", tmp_path / "flaky.bin") == "resumed"
+    assert (tmp_path / "flaky.bin").read_bytes() == FILES["/flaky.bin"]
+    assert _Handler.if_range == ['"v1"']
+
+
+def test_download_retry_and_errors(base_url: str, tmp_path: Path) -> None:
+    _Handler.fail_first = {"/b.bin"}
+    downloader = Downloader(backoff=0.01)
+    assert downloader.download(f"{base_url}/b.bin", tmp_path / "b.bin") == "downloaded"
+    assert _Handler.requests["/b.bin"] == 2
+    with pytest.raises(DuckDuckGoSearchException, match="404"):
+        downloader.download(f"{base_url}/missing.bin", tmp_path / "missing.bin")
+    with pytest.raises(DuckDuckGoSearchException, match="larger"):
+        Downloader(max_size=1000).download(f"{base_url}/a.bin", tmp_path / "big.bin")
+    assert not (tmp_path / "big.bin.part").exists()
+    with pytest.raises(DuckDuckGoSearchException, match="longer"):
+        Downloader(max_time=0.3, chunk_size=1000).fetch(f"{base_url}/slow.bin")
+
+
+def test_download_many_dedup(base_url: str, tmp_path: Path) -> None:
+    items = [(f"{base_url}{p}", tmp_path / p.lstrip("/")) for p in ("/b.bin", "/copy_of_b.bin", "/a.bin")]
+    downloader = Downloader()
+    statuses = [status for _, status in downloader.download_many(items[:1])]
+    statuses += [status for _, status in downloader.download_many(items[1:])]
+    assert sorted(statuses) == ["downloaded", "downloaded", "duplicate"]
+    assert (tmp_path / "b.bin").exists() and not (tmp_path / "copy_of_b.bin").exists()
+    assert all(status == "skipped" for _, status in Downloader().download_many(items))
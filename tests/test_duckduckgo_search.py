@@ -1,7 +1,20 @@
+import json
+import os
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
 import pytest
 
 from duckduckgo_search import DDGS
+from duckduckgo_search.bench import BENCH_HOSTS, StandInServer, _StandInHandler
+from duckduckgo_search.duckduckgo_search import _DeadlineExceeded
+from duckduckgo_search.exceptions import DuckDuckGoSearchException, RatelimitException
+from duckduckgo_search.utils import _stream_vqd
 
 
 @pytest.fixture(autouse=True)
@@ -9,6 +22,482 @@ def pause_between_tests() -> None:
     time.sleep(2)
 
 
+def test_sleep_is_thread_safe() -> None:
+    ddgs = DDGS()
+    ddgs.sleep_timestamp = time.time()
+    start = time.time()
+    with ThreadPoolExecutor(3) as executor:
+        list(executor.map(lambda _: ddgs._sleep(0.2), range(3)))
+    assert 0.55 <= time.time() - start < 1
+
+
+def test_single_flight(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def fake_text_html(self: DDGS, *args: Any) -> list[dict[str, str]]:
+        calls.append(args)
+        time.sleep(0.3)
+        return [{"title": "python", "href": "https://python.org", "body": ""}]
+
+    monkeypatch.setattr(DDGS, "_text_html", fake_text_html)
+    ddgs = DDGS()
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lambda _: ddgs.text("python", backend="html"), range(4)))
+    assert len(calls) == 1
+    assert all(r == results[0] for r in results)
+    assert len({id(r[0]) for r in results}) == 4
+
+
+class _VqdResponse:
+    headers: dict[str, str] = {}
+
+    def iter_bytes(self, chunk_size: int) -> Iterator[bytes]:
+        yield b'<script>vqd="4-123";</script>'
+
+    def close(self) -> None:
+        pass
+
+
+def test_single_flight_vqd(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def fake_get_url(self: DDGS, *args: Any, **kwargs: Any) -> _VqdResponse:
+        calls.append(args)
+        time.sleep(0.3)
+        return _VqdResponse()
+
+    monkeypatch.setattr(DDGS, "_get_url", fake_get_url)
+    ddgs = DDGS()
+    with ThreadPoolExecutor(4) as executor:
+        assert list(executor.map(lambda _: ddgs._get_vqd("python"), range(4))) == ["4-123"] * 4
+    assert len(calls) == 1
+
+
+def test_single_flight_vqd_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def fake_get_url(self: DDGS, *args: Any, deadline: float | None = None, **kwargs: Any) -> _VqdResponse:
+        calls.append(deadline)
+        if deadline is not None and deadline < time.time() + 0.3:
+            time.sleep(max(0.0, deadline - time.time()))
+            raise _DeadlineExceeded("time budget is exhausted")
+        time.sleep(0.3)
+        return _VqdResponse()
+
+    monkeypatch.setattr(DDGS, "_get_url", fake_get_url)
+    ddgs = DDGS()
+    with ThreadPoolExecutor(3) as executor:
+        short = executor.submit(ddgs._get_vqd, "python", time.time() + 0.1)
+        time.sleep(0.02)
+        unlimited = executor.submit(ddgs._get_vqd, "python")
+        waiting = executor.submit(ddgs._get_vqd, "python", time.time() + 0.2)
+        with pytest.raises(_DeadlineExceeded):
+            short.result()
+        assert unlimited.result() == "4-123"  # retried after the short budget ran out
+        with pytest.raises(_DeadlineExceeded):
+            waiting.result()  # gave up waiting for the retry at its own deadline
+    assert calls[0] is not None and calls[-1] is None  # the unlimited caller fetched without a deadline
+
+
+def test_stream_vqd() -> None:
+    page = b"<html>" + b"x" * 100 + b'<script>vqd="4-123";</script>' + b"y" * 100_000
+    for size in (1, 7, 100, 16384):
+        chunks = (page[i : i + size] for i in range(0, len(page), size))
+        vqd, read = _stream_vqd(chunks, "python")
+        assert vqd == "4-123"
+        assert read < 200 + size
+    assert _stream_vqd(iter([b"a=1&vqd=4-", b"456&b=2"]), "python") == ("4-456", 17)
+    with pytest.raises(DuckDuckGoSearchException):
+        _stream_vqd(iter([b"<html>", b"</html>"]), "python")
+
+
+class _HtmlHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        rows = "".join(f'<div><h2><a href="https://example.com/{i}">{i}</a></h2></div>' for i in range(10))
+        if self.path == "/empty":  # the marker spans two 16384 bytes chunks
+            body = b"z" * 16380 + b"No  results." + b"z" * 1000
+        elif self.path == "/blank":
+            body = b""
+        else:
+            body = f"<html><body>{rows}{'<p>filler</p>' * 10_000}</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def test_get_html_streaming() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HtmlHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    ddgs = DDGS()
+    try:
+        tree = ddgs._get_html(f"{base_url}/results", {"q": "python"}, {}, b"No  results.", None)
+        assert tree is not None and len(tree.xpath("//div[h2]")) == 10
+        assert ddgs._get_html(f"{base_url}/empty", {"q": "python"}, {}, b"No  results.", None) is None
+        assert ddgs._get_html(f"{base_url}/blank", {"q": "python"}, {}, b"No  results.", None) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_http2_fallback() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HtmlHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ddgs = DDGS(http2=True)
+    ddgs.client.set_cookies("https://duckduckgo.com", {"kl": "us-en"})
+    try:
+        client = ddgs.client
+        tree = ddgs._get_html(f"http://127.0.0.1:{server.server_port}/", {"q": "python"}, {}, b"No  results.", None)
+        assert tree is not None
+        assert ddgs.http2 is False and ddgs.client is not client
+        assert ddgs.client.get_cookies("https://duckduckgo.com") == {"kl": "us-en"}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _CrawlServer(StandInServer):
+    def __init__(self) -> None:
+        super().__init__(latency=0)
+        self.times: list[float] = []
+
+    def response(self, path: str, params: dict[str, str]) -> tuple[int, str, bytes]:
+        self.times.append(time.time())
+        if params.get("q") == "error":
+            return 202, "text/html", b""
+        return super().response(path, params)
+
+
+class _LocalDDGS(DDGS):
+    """DDGS sending its requests to $DDGS_TEST_BASE_URL, also in spawned crawl workers."""
+
+    def _get_url(self, method: Any, url: str, *args: Any, **kwargs: Any) -> Any:
+        base_url = os.environ["DDGS_TEST_BASE_URL"]
+        url = next((base_url + url[len(host) :] for host in BENCH_HOSTS if url.startswith(host)), url)
+        return super()._get_url(method, url, *args, **kwargs)
+
+
+def test_crawl(monkeypatch: pytest.MonkeyPatch) -> None:
+    with _CrawlServer() as server:
+        monkeypatch.setenv("DDGS_TEST_BASE_URL", server.url)
+        ddgs = _LocalDDGS()
+        assert ddgs.text("parent", backend="html")  # the workers must not inherit the used client
+        keywords = ["a", "b", "c", "d", "error"]
+        crawled = list(ddgs.crawl(keywords, processes=3, backend="html", max_results=5))
+    assert sorted(k for k, _, _ in crawled) == keywords
+    errors = [ex for k, _, ex in crawled if k == "error"]
+    assert isinstance(errors[0], DuckDuckGoSearchException)
+    assert all(len(results) == 5 for k, results, _ in crawled if k != "error")
+    assert all(r["title"].startswith(k) for k, results, _ in crawled for r in results)
+    assert all(t2 - t1 >= 0.7 for t1, t2 in zip(server.times, server.times[1:]))
+
+
+class _TrickleHandler(_StandInHandler):
+    """Serve the first page at once, trickle the body of the next pages in over 5 seconds."""
+
+    def _respond(self, path: str, params: dict[str, str]) -> None:
+        if not params.get("s"):
+            super()._respond(path, params)
+            return
+        status, content_type, body = self.server.response(path, params)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for i in range(0, len(body), len(body) // 5 + 1):
+            self.wfile.write(body[i : i + len(body) // 5 + 1])
+            self.wfile.flush()
+            time.sleep(1)
+
+
+def test_time_budget_trickling_body(monkeypatch: pytest.MonkeyPatch) -> None:
+    with StandInServer(latency=0) as server:
+        server.RequestHandlerClass = _TrickleHandler
+        monkeypatch.setenv("DDGS_TEST_BASE_URL", server.url)
+        results = _LocalDDGS().text("x", backend="html", max_results=50, time_budget=2.5)
+    assert len(results) == 10 and results.partial
+
+
+class _ThumbnailHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        body = self.path.encode() * 10
+        self.send_response(404 if "missing" in self.path else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def test_images_fetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ThumbnailHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    paginated = []
+
+    def fake_images(
+        self: DDGS, keywords: str, max_results: int | None = None, deadline: float | None = None
+    ) -> Iterator[dict[str, str]]:
+        for i in range(max_results or 10):
+            if deadline is not None and time.time() >= deadline:
+                raise _DeadlineExceeded("time budget is exhausted")
+            time.sleep(0.05)
+            paginated.append(i)
+            name = "missing" if i == 3 else i
+            yield {"title": f"{keywords} {i}", "thumbnail": f"{base_url}/{name}.jpg"}
+
+    monkeypatch.setattr(DDGS, "_images", fake_images)
+    try:
+        fetched = dict(
+            (r["title"], content) for r, content in DDGS().images_fetch("cat", threads=4, buffer=4, max_results=20)
+        )
+        assert len(fetched) == 19 and "cat 3" not in fetched
+        assert fetched["cat 7"] == b"/7.jpg" * 10
+
+        first = next(DDGS().images_fetch("dog", threads=2, buffer=2, max_results=20))
+        assert first[0]["title"].startswith("dog")
+        assert len(paginated) < 40
+
+        birds = list(DDGS().images_fetch("bird", max_results=20, time_budget=0.3))
+        assert 3 <= len(birds) < 8
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_text_backends() -> None:
+    ddgs = DDGS()
+    with pytest.warns(UserWarning, match="deprecated"):
+        assert sorted(b for b, _ in ddgs._text_backends("ecosia")) == ["html", "lite"]
+    assert ddgs._text_backends("lite") == [("lite", ddgs._text_lite)]
+    with pytest.raises(ValueError, match="Unknown backend"):
+        ddgs._text_backends("bing")
+    with pytest.raises(ValueError, match="Unknown backend"):
+        next(ddgs._text("python", backend="bing"))
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    active: dict[str, int] = {}
+    max_active: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def do_GET(self) -> None:
+        domain = self.headers["Host"].split(":")[0]
+        with self.lock:
+            self.active[domain] = self.active.get(domain, 0) + 1
+            self.max_active[domain] = max(self.max_active.get(domain, 0), self.active[domain])
+        time.sleep(0.1)
+        body = f"<html><body><nav>menu</nav><article><h1>{self.path}</h1><p>text of {self.path}</p></article>"
+        self.send_response(404 if "missing" in self.path else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+        with self.lock:
+            self.active[domain] -= 1
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def test_text_and_fetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def fake_text_html(self: DDGS, keywords: str, *args: Any) -> Iterator[dict[str, str]]:
+        for i in range(12):
+            host = "127.0.0.1" if i % 2 else "localhost"
+            path = "missing" if i == 5 else i
+            yield {"title": f"{keywords} {i}", "href": f"http://{host}:{server.server_port}/{path}", "body": ""}
+
+    monkeypatch.setattr(DDGS, "_text_html", fake_text_html)
+    try:
+        fetched = list(DDGS().text_and_fetch("python", backend="html", extract=True, per_domain=2))
+        assert len(fetched) == 11
+        result, content = next((r, c) for r, c in fetched if r["title"] == "python 3")
+        assert content.startswith(b"<html>")
+        assert result["content"] == "/3\ntext of /3"
+        assert _PageHandler.max_active == {"127.0.0.1": 2, "localhost": 2}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_save_and_load_state(tmp_path: Path) -> None:
+    state_path = tmp_path / "state.json"
+    assert DDGS.from_state(state_path).impersonate
+
+    ddgs = DDGS(impersonate="chrome_146", impersonate_os="windows")
+    ddgs.client.set_cookies("https://duckduckgo.com", {"l": "us-en"})
+    ddgs._vqd_cache.set("python", "4-123")
+    ddgs.sleep_timestamp = 123.0
+    ddgs.save_state(state_path)
+    ddgs.save_state(state_path)
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+    if os.name == "posix":
+        assert state_path.stat().st_mode & 0o777 == 0o600
+
+    restored = DDGS.from_state(state_path, timeout=20)
+    assert (restored.impersonate, restored.impersonate_os, restored.timeout) == ("chrome_146", "windows", 20)
+    assert restored.client.get_cookies("https://duckduckgo.com") == {"l": "us-en"}
+    assert restored._get_vqd("python") == "4-123"
+    assert restored.sleep_timestamp == 123.0
+
+
+class _FakeNewsResponse:
+    status_code = 200
+    url = "https://duckduckgo.com/news.js"
+
+    def __init__(self, keywords: str, page: int, size: int) -> None:
+        results = [
+            {"date": 0, "title": "", "excerpt": "", "url": f"https://example.com/{keywords}/{page}/{i}", "source": ""}
+            for i in range(size)
+        ]
+        self.content = json.dumps({"results": results, "next": f"news.js?s={page + 1}"}).encode()
+
+
+class _FakeNewsClient:
+    """news.js stand-in: page n of every query has page_sizes[n] results, or 1 beyond the list."""
+
+    def __init__(self, page_sizes: list[int] | None = None) -> None:
+        self.page_sizes = page_sizes or []
+        self.requests: list[tuple[str, int]] = []
+
+    def request(self, method: str, url: str, params: dict[str, str], **kwargs: Any) -> _FakeNewsResponse:
+        page = int(params.get("s", 0))
+        self.requests.append((params["q"], page))
+        size = self.page_sizes[page] if page < len(self.page_sizes) else 1
+        return _FakeNewsResponse(params["q"], page, size)
+
+
+def test_time_budget_returns_partial_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(DDGS, "_get_vqd", lambda self, keywords, deadline=None: "4-123")
+    ddgs = DDGS()
+    ddgs.client = _FakeNewsClient()
+    start = time.time()
+    results = ddgs.news("python", max_results=100, time_budget=1.6)
+    assert time.time() - start < 1.6
+    assert results.partial is True
+    assert [r["url"] for r in results] == [f"https://example.com/python/{page}/0" for page in (0, 1, 2)]
+    assert ddgs.news("python", max_results=1).partial is False
+
+
+def test_fields(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(DDGS, "_get_vqd", lambda self, keywords, deadline=None: "4-123")
+    ddgs = DDGS()
+    ddgs.client = _FakeNewsClient([3])
+    results = ddgs.news("python", fields=["url", "title"])
+    assert results == [{"url": f"https://example.com/python/0/{i}", "title": ""} for i in range(3)]
+    assert list(ddgs.news("python")[0]) == ["date", "title", "body", "url", "image", "source"]
+    with pytest.raises(ValueError, match="excerpt"):
+        ddgs.news("python", fields=["excerpt"])
+    with pytest.raises(ValueError, match="thumbnail"):
+        ddgs.videos("python", fields=["title", "thumbnail"])
+    with StandInServer(latency=0) as server:
+        monkeypatch.setenv("DDGS_TEST_BASE_URL", server.url)
+        assert _LocalDDGS().videos("python", max_results=3, fields=[]) == [{}, {}, {}]
+
+
+def test_empty_results_and_page_prediction(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(DDGS, "_get_vqd", lambda self, keywords, deadline=None: "4-123")
+    ddgs = DDGS()
+    ddgs._sleep = lambda *args, **kwargs: None  # type: ignore[method-assign]
+    ddgs._page_predictor.explore = 0
+    ddgs.client = client = _FakeNewsClient([30, 5, 0, 0, 0])
+
+    for i in range(5):
+        assert len(ddgs.news(f"topic {i}", max_results=100)) == 35
+    assert client.requests[:5] == [("topic 0", page) for page in range(5)]
+    assert len(client.requests) < 5 * 5
+    skipped = ddgs._page_predictor.skipped
+    assert len(ddgs.news("topic 5", max_results=100)) == 35
+    assert client.requests[-2:] == [("topic 5", 0), ("topic 5", 1)]
+    assert ddgs._page_predictor.skipped == skipped + 1
+
+    client.page_sizes = [0]
+    client.requests.clear()
+    assert ddgs.news("nothing", max_results=100) == []
+    assert ddgs.news("nothing", max_results=100) == []
+    assert client.requests == [("nothing", 0)]
+
+
+def test_search_all(monkeypatch: pytest.MonkeyPatch) -> None:
+    vqd_calls = []
+
+    class FakeResponse:
+        headers: dict[str, str] = {}
+
+        def iter_bytes(self, chunk_size: int) -> Iterator[bytes]:
+            yield b'<script>vqd="4-123";</script>'
+
+        def close(self) -> None:
+            pass
+
+    def fake_get_url(self: DDGS, *args: Any, **kwargs: Any) -> FakeResponse:
+        vqd_calls.append(args)
+        time.sleep(0.3)
+        return FakeResponse()
+
+    def fake_vertical(name: str) -> Any:
+        def search(self: DDGS, keywords: str, **kwargs: Any) -> list[dict[str, str]]:
+            if name != "text":
+                assert self._get_vqd(keywords) == "4-123"
+            if name == "videos":
+                raise DuckDuckGoSearchException("videos failed")
+            time.sleep(0.3)
+            return [{"vertical": name, "max_results": kwargs["max_results"]}]
+
+        return search
+
+    for name in ("text", "images", "videos", "news"):
+        monkeypatch.setattr(DDGS, name, fake_vertical(name))
+    monkeypatch.setattr(DDGS, "_get_url", fake_get_url)
+    ddgs = DDGS()
+    start = time.time()
+    results = ddgs.search_all("python", per_vertical_max=5)
+    assert time.time() - start < 1.0
+    assert list(results) == ["text", "images", "videos", "news"]
+    assert results["news"] == [{"vertical": "news", "max_results": 5}]
+    assert results["videos"] == [] and results["videos"].partial is True  # type: ignore[attr-defined]
+    assert len(vqd_calls) == 1
+    assert list(ddgs.search_all("python", verticals=["news", "text", "news"])) == ["news", "text"]
+    with pytest.raises(DuckDuckGoSearchException):
+        ddgs.search_all("python", verticals=["videos"])
+
+
+def test_search_regions(monkeypatch: pytest.MonkeyPatch) -> None:
+    serps = {
+        "us-en": ["a", "b", "c"],
+        "uk-en": ["b", "a", "d"],
+        "de-de": ["e", "b"],
+    }
+
+    def fake_text(self: DDGS, keywords: str, region: str, **kwargs: Any) -> list[dict[str, str]]:
+        if region == "fr-fr":
+            raise RatelimitException("ratelimit")
+        time.sleep(0.3)
+        return [{"title": name, "href": f"https://{name}.example.com/", "body": region} for name in serps[region]]
+
+    monkeypatch.setattr(DDGS, "text", fake_text)
+    start = time.time()
+    results = DDGS().search_regions("python", ["us-en", "uk-en", "de-de", "fr-fr"], max_workers=4)
+    assert time.time() - start < 0.6
+    assert [r["title"] for r in results] == ["b", "a", "e", "c", "d"]
+    assert results[0]["regions"] == ["us-en", "uk-en", "de-de"]
+    assert results[0]["body"] == "us-en"
+    assert results[2]["regions"] == ["de-de"]
+    assert results.partial is True  # type: ignore[attr-defined]
+    with pytest.raises(RatelimitException):
+        DDGS().search_regions("python", ["fr-fr"])
+    with pytest.raises(TypeError, match="regions"):
+        DDGS().search_regions("python", ["us-en"], region="uk-en")
+
+
 def test_context_manager() -> None:
     with DDGS() as ddgs:
         results = ddgs.news("cars", max_results=30)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from duckduckgo_search import DDGS
+from duckduckgo_search.duckduckgo_search import SearchResults
+from duckduckgo_search.gateway import DDGSGateway
+
+
+def _start(**kwargs: Any) -> DDGSGateway:
+    server = DDGSGateway(port=0, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture()
+def gateway() -> Iterator[DDGSGateway]:
+    server = _start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server: DDGSGateway, path: str) -> tuple[int, Any]:
+    try:
+        with urlopen(f"http://127.0.0.1:{server.server_port}{path}") as resp:
+            return resp.status, json.loads(resp.read())
+    except HTTPError as ex:
+        return ex.code, json.loads(ex.read())
+
+
+def test_gateway_coalesces_and_caches(gateway: DDGSGateway, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def fake_text(self: DDGS, keywords: str, max_results: int | None = None) -> list[dict[str, str]]:
+        calls.append((keywords, max_results))
+        time.sleep(0.5)
+        return [{"title": keywords, "href": "https://example.com", "body": ""}]
+
+    monkeypatch.setattr(DDGS, "text", fake_text)
+    with ThreadPoolExecutor(8) as executor:
+        responses = list(executor.map(lambda _: _get(gateway, "/text?keywords=python&max_results=5"), range(8)))
+    assert all(status == 200 and data[0]["title"] == "python" for status, data in responses)
+    assert _get(gateway, "/text?keywords=python&max_results=5")[0] == 200
+    assert calls == [("python", 5)]
+    status, stats = _get(gateway, "/stats")
+    assert status == 200 and stats["scheduler"]["interactive"]["queued"] == 0 and "profiles" in stats
+
+
+def test_gateway_partial_results(gateway: DDGSGateway, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def fake_text(self: DDGS, keywords: str, time_budget: float | None = None) -> list[dict[str, str]]:
+        calls.append(keywords)
+        results = SearchResults([{"title": keywords, "href": "https://example.com", "body": ""}])
+        results.partial = True
+        return results
+
+    monkeypatch.setattr(DDGS, "text", fake_text)
+    for _ in range(2):
+        with urlopen(f"http://127.0.0.1:{gateway.server_port}/text?keywords=python&time_budget=1") as resp:
+            assert resp.headers["X-DDGS-Partial"] == "1"
+            assert json.loads(resp.read())[0]["title"] == "python"
+    assert calls == ["python", "python"]
+
+
+def test_gateway_one_engine_per_priority(gateway: DDGSGateway, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def fake_news(self: DDGS, keywords: str) -> list[dict[str, str]]:
+        calls.append((self, self.priority, self._thread_tenant.name))
+        return []
+
+    monkeypatch.setattr(DDGS, "news", fake_news)
+    for i in range(3):
+        assert _get(gateway, f"/news?keywords=q{i}&priority=bulk&tenant=t{i}")[0] == 200
+    assert len({engine for engine, _, _ in calls}) == 1
+    assert [(priority, tenant) for _, priority, tenant in calls] == [("bulk", "t0"), ("bulk", "t1"), ("bulk", "t2")]
+    assert sorted(gateway.engines) == ["bulk", "interactive"]
+
+
+def test_gateway_bad_requests(gateway: DDGSGateway) -> None:
+    assert _get(gateway, "/maps?keywords=python")[0] == 404
+    assert _get(gateway, "/text?keywords=python&foo=bar")[0] == 400
+    assert _get(gateway, "/text?keywords=python&max_results=ten")[0] == 400
+    assert _get(gateway, "/news?region=us-en")[0] == 400
+    assert _get(gateway, "/news?keywords=python&priority=urgent")[0] == 400
+    assert _get(gateway, "/news?keywords=python&fields=title,excerpt")[0] == 400
+    assert _get(gateway, "/videos?keywords=python&fields=title,excerpt")[0] == 400
+
+
+def test_gateway_rejects_over_capacity(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_news(self: DDGS, keywords: str) -> list[dict[str, str]]:
+        time.sleep(0.5)
+        return []
+
+    monkeypatch.setattr(DDGS, "news", fake_news)
+    server = _start(max_concurrency=1, max_queue=0, cache_ttl=0)
+    try:
+        with ThreadPoolExecutor(2) as executor:
+            first = executor.submit(_get, server, "/news?keywords=first")
+            time.sleep(0.1)
+            second = executor.submit(_get, server, "/news?keywords=second")
+            assert first.result()[0] == 200
+            assert second.result()[0] == 503
+    finally:
+        server.shutdown()
+        server.server_close()
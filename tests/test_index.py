@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from duckduckgo_search import DDGS
+from duckduckgo_search.index import ResultIndex
+
+
+def _results(*titles: str) -> list[dict[str, str]]:
+    return [
+        {"title": title, "href": f"https://example.com/{i}", "body": f"about {title}"} for i, title in enumerate(titles)
+    ]
+
+
+def test_add_and_search(tmp_path: Path) -> None:
+    with ResultIndex(tmp_path / "index.db", batch_size=3) as index:
+        index.add(_results("python asyncio", "rust tokio"), keywords="async")
+        assert index._pending  # below batch_size
+        index.add(
+            [
+                {
+                    "date": "2024-01-01T00:00:00+00:00",
+                    "title": "Python 3.13",
+                    "body": "released",
+                    "url": "https://news.example.com/1",
+                }
+            ],
+            "news",
+        )
+        assert not index._pending
+        index.add(_results("python asyncio tutorial"), keywords="async")  # same url, new title
+
+    with ResultIndex(tmp_path / "index.db") as index:
+        assert len(index) == 3
+        assert [r["title"] for r in index.search("Python")] == ["python asyncio tutorial", "Python 3.13"]
+        assert index.search("python", vertical="news")[0]["date"] == "2024-01-01T00:00:00+00:00"
+        assert "\n" not in index._conn.execute("SELECT data FROM results LIMIT 1").fetchone()[0]  # compact json
+        assert index.search("tokio about") == [_results("x", "rust tokio")[1]]
+        assert index.search('"python" (*') == index.search("python")
+        assert index.search("example.com/1", max_results=1)[0]["href"] == "https://example.com/1"
+        assert index.search("golang") == [] and index.search(":") == []
+
+
+def test_ddgs_index_sink(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_text_html(self: DDGS, keywords: str, *args: Any) -> Iterator[dict[str, str]]:
+        yield from _results(f"{keywords} one", f"{keywords} two")
+
+    monkeypatch.setattr(DDGS, "_text_html", fake_text_html)
+    ddgs = DDGS(index=ResultIndex())
+    assert len(ddgs.text("kotlin", backend="html")) == 2
+    assert [r["title"] for r in ddgs.local_search("kotlin two")] == ["kotlin two"]
+    assert ddgs.local_search("kotlin", vertical="news") == []
+    with pytest.raises(AssertionError):
+        DDGS().local_search("kotlin")
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from duckduckgo_search import DDGS
+from duckduckgo_search.monitor import NewsMonitor
+
+NOW = datetime.now(timezone.utc)
+
+
+class _FakeNews:
+    """DDGS._news stand-in yielding the articles newest first, counting the consumed ones."""
+
+    def __init__(self) -> None:
+        self.articles: list[dict[str, str]] = []
+        self.consumed = 0
+        self.timelimits: list[str | None] = []
+
+    def publish(self, count: int, hours_ago: int = 0) -> None:
+        start = len(self.articles)
+        for i in range(start, start + count):
+            date = (NOW - timedelta(hours=hours_ago, minutes=-i)).isoformat()
+            self.articles.append({"date": date, "title": f"article {i}", "url": f"https://example.com/{i}"})
+
+    def news(
+        self, keywords: str, region: str, safesearch: str, timelimit: str | None, *args: Any
+    ) -> Iterator[dict[str, str]]:
+        self.timelimits.append(timelimit)
+        for article in sorted(self.articles, key=lambda a: a["date"], reverse=True):
+            self.consumed += 1
+            yield article
+
+
+@pytest.fixture()
+def fake_news(monkeypatch: pytest.MonkeyPatch) -> _FakeNews:
+    fake = _FakeNews()
+    monkeypatch.setattr(DDGS, "_news", lambda self, *args: fake.news(*args))
+    return fake
+
+
+def test_poll_returns_only_new_articles(fake_news: _FakeNews, tmp_path: Path) -> None:
+    fake_news.publish(50, hours_ago=30)
+    state_path = tmp_path / "monitor.json"
+    with NewsMonitor(state_path) as monitor:
+        assert len(monitor.poll("python")) == 50
+        assert fake_news.timelimits == [None]
+
+    fake_news.publish(3)
+    fake_news.consumed = 0
+    monitor = NewsMonitor(state_path, stop_after=5)
+    new = monitor.poll("python")
+    assert [a["title"] for a in new] == ["article 52", "article 51", "article 50"]
+    assert fake_news.consumed == 3 + 5
+    assert fake_news.timelimits[-1] == "w"
+    assert monitor.poll("python") == []
+    assert monitor.poll("python", region="de-de") != []
+
+
+def test_poll_many(fake_news: _FakeNews, tmp_path: Path) -> None:
+    fake_news.publish(2)
+    monitor = NewsMonitor(tmp_path / "monitor.json", retention=timedelta(hours=1))
+    polled = list(monitor.poll_many(["a", "b"]))
+    assert [(k, len(new), ex) for k, new, ex in polled] == [("a", 2, None), ("b", 2, None)]
+    assert [p.name for p in tmp_path.iterdir()] == ["monitor.json"]
+    assert fake_news.timelimits == [None, None]
+    assert [len(new) for _, new, _ in monitor.poll_many(["a", "b"])] == [0, 0]
+    assert fake_news.timelimits[-2:] == ["d", "d"]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from duckduckgo_search import DDGS
+from duckduckgo_search.exceptions import RatelimitException
+from duckduckgo_search.profiles import ProfileStats
+
+
+def test_choose_prefers_fewer_ratelimits() -> None:
+    stats = ProfileStats(explore=0.2)
+    for _ in range(20):
+        stats.record("chrome_146", ratelimited=False)
+        stats.record("edge_146", ratelimited=True)
+    chosen = Counter(stats.choose(["chrome_146", "edge_146", "safari_18"]) for _ in range(1000))
+    assert chosen["chrome_146"] > 800
+    assert chosen["edge_146"] > 20 and chosen["safari_18"] > 20  # exploration
+    assert stats.stats()["edge_146"] == {"requests": 20, "ratelimits": 20, "ratelimit_rate": 21 / 22}
+    assert ProfileStats(explore=0).choose(["chrome_146", "edge_146"]) in ("chrome_146", "edge_146")
+
+
+class _RatelimitHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        self.send_response(429 if self.path == "/limited" else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def test_adaptive_rotation() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RatelimitHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    stats = ProfileStats(explore=0)
+    ddgs = DDGS(impersonate="adaptive", impersonate_os="windows", profile_stats=stats)
+    fixed = DDGS(impersonate="chrome_146", impersonate_os="windows", profile_stats=stats)
+    try:
+        profile, client = ddgs.impersonate, ddgs.client
+        with pytest.raises(RatelimitException):
+            ddgs._get_url("GET", f"{base_url}/limited")
+        assert ddgs.client is not client and ddgs.impersonate != profile
+        assert ddgs.impersonate_os == "windows"
+        assert stats.stats()[profile] == {"requests": 1, "ratelimits": 1, "ratelimit_rate": 2 / 3}
+
+        client = fixed.client
+        assert fixed._get_url("GET", f"{base_url}/ok").status_code == 200
+        with pytest.raises(RatelimitException):
+            fixed._get_url("GET", f"{base_url}/limited")
+        assert fixed.client is client
+        assert stats.stats()["windows"] == {"requests": 3, "ratelimits": 2, "ratelimit_rate": 0.6}
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from duckduckgo_search.scheduler import RequestScheduler
+
+
+def _run(scheduler: RequestScheduler, priority: str, tenant: str, order: list[str], hold: float = 0.0) -> None:
+    assert scheduler.acquire(priority, tenant)
+    order.append(tenant)
+    time.sleep(hold)
+    scheduler.release(priority)
+
+
+def _start_all(
+    scheduler: RequestScheduler, requests: list[tuple[str, str]], order: list[str]
+) -> list[threading.Thread]:
+    scheduler._next_slot = time.time() + 0.3  # queue all requests before the first slot
+    threads = [threading.Thread(target=_run, args=(scheduler, p, t, order)) for p, t in requests]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_class_shares() -> None:
+    scheduler = RequestScheduler(interval=0.01, concurrency={"interactive": 10, "bulk": 10})
+    order: list[str] = []
+    threads = _start_all(scheduler, [("bulk", "bulk")] * 10 + [("interactive", "interactive")] * 10, order)
+    for thread in threads:
+        thread.join()
+    assert order[:10].count("interactive") == 8
+    assert scheduler.stats()["bulk"]["dispatched"] == 10
+
+
+def test_tenant_weights() -> None:
+    scheduler = RequestScheduler(interval=0.01, tenant_weights={"a": 2})
+    order: list[str] = []
+    threads = _start_all(scheduler, [("bulk", "a")] * 8 + [("bulk", "b")] * 8, order)
+    for thread in threads:
+        thread.join()
+    assert order[:9].count("a") == 6
+
+
+def test_interactive_latency_during_bulk_crawl() -> None:
+    scheduler = RequestScheduler(interval=0.05)
+    order: list[str] = []
+    bulk = [threading.Thread(target=_run, args=(scheduler, "bulk", "crawl", order, 0.1)) for _ in range(30)]
+    for thread in bulk:
+        thread.start()
+    time.sleep(0.3)
+    start = time.time()
+    _run(scheduler, "interactive", "user", order)
+    assert time.time() - start < 0.15
+    assert scheduler.stats()["bulk"]["active"] <= 2
+    for thread in bulk:
+        thread.join()
+
+
+def test_deadline() -> None:
+    scheduler = RequestScheduler(interval=1)
+    assert scheduler.acquire("bulk", deadline=time.time() + 1)
+    scheduler.release("bulk")
+    start = time.time()
+    assert not scheduler.acquire("interactive", deadline=time.time() + 0.2)
+    assert time.time() - start < 0.5
+    assert scheduler.stats()["interactive"]["queued"] == 0
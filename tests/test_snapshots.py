@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from duckduckgo_search.snapshots import SnapshotStore
+
+
+def _results(*names: str) -> list[dict[str, str]]:
+    return [{"title": name, "href": f"https://{name}.example.com/", "body": f"about {name}"} for name in names]
+
+
+def test_add_and_diff(tmp_path: Path) -> None:
+    with SnapshotStore(tmp_path / "serp.db") as store:
+        assert store.add("python", _results("a", "b", "c", "d"), taken_at=1)
+        changed = _results("b", "a", "c", "e")
+        changed[2]["title"] = "c, new title"
+        assert store.add("python", changed, taken_at=2)
+        assert not store.add("python", changed, taken_at=3)
+
+        diff = store.diff("python", old=1, new=2)
+        assert diff == {
+            "new": [("https://e.example.com/", 4)],
+            "dropped": [("https://d.example.com/", 4)],
+            "moved": [("https://b.example.com/", 2, 1), ("https://a.example.com/", 1, 2)],
+            "changed": ["https://c.example.com/"],
+        }
+        assert store.diff("python") == {"new": [], "dropped": [], "moved": [], "changed": []}
+        assert len(store.diff("python", new=1)["new"]) == 4
+        with pytest.raises(KeyError):
+            store.diff("rust")
+
+    with SnapshotStore(tmp_path / "serp.db") as store:
+        history = store.history("python")
+        assert [t for t, _ in history] == [1, 2, 3]
+        assert history[1][1] == history[2][1]  # unchanged results share one result set
+
+
+def test_diff_all() -> None:
+    store = SnapshotStore()
+    store.add_many([(f"q{i}", _results("a", "b")) for i in range(1000)], taken_at=1)
+    changed = store.add_many(
+        [(f"q{i}", _results("b", "a") if i % 100 == 0 else _results("a", "b")) for i in range(1000)], taken_at=2
+    )
+    assert len(changed) == 10
+    diffs = dict(store.diff_all())
+    assert sorted(diffs) == sorted(changed)
+    assert diffs["q0"]["moved"] == [("https://b.example.com/", 2, 1), ("https://a.example.com/", 1, 2)]
+    assert len(dict(store.diff_all(changed_only=False))) == 1000
+    assert store._conn.execute("SELECT COUNT(*) FROM resultsets").fetchone() == (2,)
+
+
+def test_add_many_searches_outside_the_transaction() -> None:
+    store = SnapshotStore()
+
+    def searches() -> Iterator[tuple[str, list[dict[str, str]]]]:
+        for query in ("python", "rust"):
+            assert not store._conn.in_transaction
+            assert store._lock.acquire(blocking=False)
+            store._lock.release()
+            yield query, _results(query)
+
+    assert store.add_many(searches()) == ["python", "rust"]